@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Storage size and I/O time of ``CompressedJSONField`` against ``JSONField``.
+
+Runs against the test settings (in-memory SQLite) with the ``tests`` app's
+``Document`` and ``CompressedDocument`` models::
+
+    python benchmarks/bench_compressed.py --rows 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+
+import django
+from django.conf import settings
+
+django.setup()
+settings.DEBUG = False
+
+from django.db import connection  # noqa: E402
+
+from tests.models import CompressedDocument, Document  # noqa: E402
+
+RACES = ['Hobbit', 'Elf', 'Dwarf', 'Human', 'Maia']
+ITEMS = ['sword', 'bow', 'cloak', 'rope', 'lembas', 'ring', 'staff', 'shield']
+
+
+def sample_document(rng, size):
+    """A character sheet with ``size`` inventory entries."""
+    return {
+        'name': f'character {rng.randrange(10 ** 6)}',
+        'race': rng.choice(RACES),
+        'stats': {stat: rng.randrange(1, 20) for stat in ('hp', 'mp', 'str', 'dex', 'int')},
+        'inventory': [
+            {'item': rng.choice(ITEMS), 'quantity': rng.randrange(1, 5), 'equipped': rng.random() < 0.2}
+            for _i in range(size)
+        ],
+    }
+
+
+def timed(func):
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def column_bytes(model, column):
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT SUM(LENGTH({column})) FROM {model._meta.db_table}')
+        return cursor.fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--items', type=int, default=50, help='Inventory entries per document.')
+    args = parser.parse_args()
+
+    with connection.schema_editor() as editor:
+        editor.create_model(Document)
+        editor.create_model(CompressedDocument)
+
+    rng = random.Random(0)
+    documents = [sample_document(rng, args.items) for _i in range(args.rows)]
+
+    results = {}
+    for label, model, make in (
+        ('JSONField', Document, lambda doc: Document(name='', data=doc)),
+        ('Compressed', CompressedDocument, lambda doc: CompressedDocument(data=doc)),
+    ):
+        write = timed(lambda model=model, make=make: model.objects.bulk_create(
+            (make(doc) for doc in documents), batch_size=500,
+        ))
+        size = column_bytes(model, 'data')
+        read = timed(lambda model=model: [obj.data for obj in model.objects.all().iterator(chunk_size=500)])
+        # Rows loaded without touching the document, as in a changelist.
+        skim = timed(lambda model=model: [obj.pk for obj in model.objects.all().iterator(chunk_size=500)])
+        results[label] = size
+        print(
+            f'{label:<10} {args.rows:8d} rows  stored {size / 1024 / 1024:8.1f} MiB  write {write:6.2f} s  '
+            f'read {read:6.2f} s  load untouched {skim:6.2f} s'
+        )
+    print(f"Compressed size: {100.0 * results['Compressed'] / results['JSONField']:.1f}% of JSONField")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Time and peak memory of the NDJSON export and import on N rows.
+
+Runs against the test settings (in-memory SQLite) and the ``tests`` app's
+``Document`` model::
+
+    python benchmarks/bench_ndjson.py --rows 100000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+
+import django
+from django.conf import settings
+
+django.setup()
+# The test settings run with DEBUG on, which would keep every query in memory.
+settings.DEBUG = False
+
+from django.db import connection  # noqa: E402
+
+from django_json_widget.ndjson import import_ndjson, iter_ndjson  # noqa: E402
+from tests.models import Document  # noqa: E402
+
+
+def measure(label, rows, func, reset=None):
+    """Time ``func`` on its own, then run it again under tracemalloc."""
+    started = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - started
+    if reset:
+        reset()
+    tracemalloc.start()
+    func()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<8} {rows:8d} rows  {elapsed:7.2f} s  {rows / elapsed:9.0f} rows/s  peak {peak / 2 ** 20:6.1f} MiB')
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--chunk-size', type=int, default=500)
+    args = parser.parse_args()
+
+    with connection.schema_editor() as editor:
+        editor.create_model(Document)
+
+    document = {'name': 'character', 'stats': {'hp': 100, 'mp': 40}, 'tags': ['a', 'b', 'c'] * 5}
+    Document.objects.bulk_create(
+        (Document(name=f'doc {i}', data=dict(document, id=i)) for i in range(args.rows)),
+        batch_size=1000,
+    )
+    queryset = Document.objects.all()
+
+    output = io.StringIO()
+
+    def export():
+        for chunk in iter_ndjson(queryset, ['data'], chunk_size=args.chunk_size):
+            output.write(chunk)
+
+    # The exported text itself is kept in memory here; measure the stream
+    # separately from the buffer holding it.
+    measure('export', args.rows, lambda: sum(len(chunk) for chunk in iter_ndjson(
+        queryset, ['data'], chunk_size=args.chunk_size)))
+    export()
+    output.seek(0)
+    result = measure(
+        'import', args.rows, lambda: import_ndjson(output, queryset, ['data'], args.chunk_size),
+        reset=lambda: output.seek(0),
+    )
+    assert result.updated == args.rows, result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+import logging
+import time
+from collections import namedtuple
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.http import StreamingHttpResponse
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from .forms import JSONEditorField
+from .models import json_field_names
+from .ndjson import iter_ndjson
+from .patch import PatchError, apply_json_patch, apply_merge_patch, json_equal, validate_json_patch
+from .precompute import invalidate
+from .widgets import JSONEditorWidget
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_FAILURES = 20
+
+JSON_PATCH = 'json_patch'
+MERGE_PATCH = 'merge_patch'
+PATCH_TYPES = (
+    (JSON_PATCH, _('JSON Patch (RFC 6902)')),
+    (MERGE_PATCH, _('JSON Merge Patch (RFC 7396)')),
+)
+
+BulkPatchResult = namedtuple('BulkPatchResult', 'processed updated failed failures')
+
+
+def bulk_patch(queryset, field_name, patch, patch_type=JSON_PATCH, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Apply ``patch`` to ``field_name`` on every row of ``queryset``.
+
+    Rows are read ``chunk_size`` at a time with ``.iterator()`` and changed
+    rows are written back with ``bulk_update`` in batches of the same size,
+    so at most two chunks of documents are in memory at once. ``progress``,
+    if given, is called with the running ``BulkPatchResult`` after each chunk.
+    Rows the patch cannot be applied to are left untouched and reported in
+    ``failures`` as ``(pk, message)`` pairs, up to ``MAX_REPORTED_FAILURES``.
+    """
+    apply = apply_json_patch if patch_type == JSON_PATCH else apply_merge_patch
+    model = queryset.model
+    pk_name = model._meta.pk.name
+    rows = queryset.only(pk_name, field_name).order_by(pk_name).iterator(chunk_size=chunk_size)
+
+    processed = updated = failed = 0
+    failures = []
+    batch = []
+
+    def flush():
+        model._default_manager.bulk_update(batch, [field_name], batch_size=chunk_size)
+        invalidate(model, [field_name], [obj.pk for obj in batch])
+        count = len(batch)
+        batch.clear()
+        return count
+
+    for obj in rows:
+        processed += 1
+        value = getattr(obj, field_name)
+        try:
+            patched = apply(value, patch)
+        except PatchError as e:
+            failed += 1
+            if len(failures) < MAX_REPORTED_FAILURES:
+                failures.append((obj.pk, str(e)))
+        else:
+            if not json_equal(patched, value):
+                setattr(obj, field_name, patched)
+                batch.append(obj)
+
+        if len(batch) >= chunk_size:
+            updated += flush()
+        if processed % chunk_size == 0:
+            result = BulkPatchResult(processed, updated, failed, failures)
+            logger.info('Bulk JSON edit of %s.%s: %s', model._meta.label, field_name, result)
+            if progress:
+                progress(result)
+
+    if batch:
+        updated += flush()
+    result = BulkPatchResult(processed, updated, failed, failures)
+    if progress:
+        progress(result)
+    return result
+
+
+class BulkJSONEditForm(forms.Form):
+    field = forms.ChoiceField(label=_('Field'))
+    patch_type = forms.ChoiceField(label=_('Patch type'), choices=PATCH_TYPES)
+    patch = JSONEditorField(label=_('Patch'), widget=JSONEditorWidget(height='300px'))
+
+    def __init__(self, *args, field_names=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['field'].choices = [(name, name) for name in field_names]
+        # There is no stored patch the "unchanged" marker could stand for.
+        self.fields['patch'].widget.unchanged_marker = False
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('patch_type') == JSON_PATCH and 'patch' in cleaned_data:
+            try:
+                validate_json_patch(cleaned_data['patch'])
+            except PatchError as e:
+                self.add_error('patch', str(e))
+        return cleaned_data
+
+
+def _posted_action(request):
+    # The changelist may post one action per action form; ``index`` tells
+    # which one was used, as in ``ModelAdmin.response_action``.
+    actions = request.POST.getlist('action')
+    try:
+        return actions[int(request.POST.get('index', 0))]
+    except (ValueError, IndexError):
+        return actions[0] if actions else 'bulk_edit_json'
+
+
+@admin.action(description=_('Edit JSON of selected %(verbose_name_plural)s'), permissions=['change'])
+def bulk_edit_json(modeladmin, request, queryset):
+    """
+    Action applying one JSON Patch or merge patch to a JSON field of every
+    selected object.
+
+    The first call displays a form with a JSONEditor for the patch; once it is
+    submitted the patch is applied in chunks (see ``bulk_patch``) and a summary
+    with per-row failures is reported back to the changelist. The model admin
+    may set ``json_bulk_edit_fields`` and ``json_bulk_edit_chunk_size``.
+    """
+    opts = modeladmin.model._meta
+    field_names = getattr(modeladmin, 'json_bulk_edit_fields', None) or json_field_names(modeladmin.model)
+    chunk_size = getattr(modeladmin, 'json_bulk_edit_chunk_size', DEFAULT_CHUNK_SIZE)
+
+    if request.POST.get('json_edit_apply'):
+        form = BulkJSONEditForm(request.POST, field_names=field_names, prefix='json_edit')
+        if form.is_valid():
+            started = time.monotonic()
+            result = bulk_patch(
+                queryset,
+                form.cleaned_data['field'],
+                form.cleaned_data['patch'],
+                form.cleaned_data['patch_type'],
+                chunk_size=chunk_size,
+            )
+            modeladmin.message_user(
+                request,
+                ngettext(
+                    'Updated %(updated)d of %(processed)d object in %(seconds).1f seconds.',
+                    'Updated %(updated)d of %(processed)d objects in %(seconds).1f seconds.',
+                    result.processed,
+                ) % dict(result._asdict(), seconds=time.monotonic() - started),
+                messages.SUCCESS,
+            )
+            if result.failed:
+                modeladmin.message_user(
+                    request,
+                    ngettext(
+                        'The patch could not be applied to %(failed)d object: %(failures)s',
+                        'The patch could not be applied to %(failed)d objects: %(failures)s',
+                        result.failed,
+                    ) % {
+                        'failed': result.failed,
+                        'failures': '; '.join('{}: {}'.format(*failure) for failure in result.failures),
+                    },
+                    messages.WARNING,
+                )
+            return None
+    else:
+        form = BulkJSONEditForm(field_names=field_names, prefix='json_edit', initial={'patch': []})
+
+    context = {
+        **modeladmin.admin_site.each_context(request),
+        'title': _('Edit JSON of multiple objects'),
+        'subtitle': None,
+        'opts': opts,
+        'form': form,
+        'media': modeladmin.media + form.media,
+        'action': _posted_action(request),
+        'select_across': request.POST.get('select_across', '0'),
+        'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+        'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+    }
+    request.current_app = modeladmin.admin_site.name
+    return TemplateResponse(
+        request,
+        [
+            f'admin/{opts.app_label}/{opts.model_name}/bulk_edit_json.html',
+            f'admin/{opts.app_label}/bulk_edit_json.html',
+            'django_json_widget/bulk_edit_json.html',
+        ],
+        context,
+    )
+
+
+@admin.action(description=_('Export JSON of selected %(verbose_name_plural)s as NDJSON'), permissions=['view'])
+def export_ndjson(modeladmin, _request, queryset):
+    """
+    Action streaming the JSON fields of the selected objects as NDJSON, one
+    object per line. The model admin may set ``ndjson_fields`` and
+    ``ndjson_chunk_size``.
+    """
+    opts = modeladmin.model._meta
+    field_names = getattr(modeladmin, 'ndjson_fields', None) or json_field_names(modeladmin.model)
+    chunk_size = getattr(modeladmin, 'ndjson_chunk_size', DEFAULT_CHUNK_SIZE)
+    response = StreamingHttpResponse(
+        iter_ndjson(queryset, field_names, chunk_size=chunk_size),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = f'attachment; filename="{opts.model_name}.ndjson"'
+    return response
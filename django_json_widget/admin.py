@@ -0,0 +1,231 @@
+import json
+import time
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.utils import quote
+from django.contrib.admin.views.main import ChangeList
+from django.core.exceptions import PermissionDenied
+from django.db.models import F, TextField
+from django.db.models.fields.json import KeyTransform
+from django.db.models.functions import Cast, Substr
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.urls import NoReverseMatch, path, reverse
+from django.utils.html import format_html
+from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
+
+from .models import json_field_names
+from .ndjson import DEFAULT_CHUNK_SIZE, import_ndjson
+from .precompute import PREVIEW_LENGTH, get_precomputed
+
+
+class NDJSONImportForm(forms.Form):
+    file = forms.FileField(label=_('NDJSON file'))
+
+
+class NDJSONImportMixin:
+    """
+    ``ModelAdmin`` mixin adding an "Import NDJSON" page to the changelist,
+    which streams an uploaded file produced by the ``export_ndjson`` action
+    back into the JSON fields of existing objects.
+    """
+    change_list_template = 'django_json_widget/change_list.html'
+    ndjson_fields = None
+    ndjson_chunk_size = DEFAULT_CHUNK_SIZE
+
+    def get_urls(self):
+        info = self.opts.app_label, self.opts.model_name
+        return [
+            path(
+                'import-ndjson/',
+                self.admin_site.admin_view(self.import_ndjson_view),
+                name='{}_{}_import_ndjson'.format(*info),
+            ),
+            *super().get_urls(),
+        ]
+
+    def import_ndjson_view(self, request):
+        if not self.has_change_permission(request):
+            raise PermissionDenied
+
+        opts = self.opts
+        form = NDJSONImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            started = time.monotonic()
+            result = import_ndjson(
+                form.cleaned_data['file'],
+                self.get_queryset(request),
+                self.ndjson_fields or json_field_names(self.model),
+                chunk_size=self.ndjson_chunk_size,
+            )
+            self.message_user(
+                request,
+                ngettext(
+                    'Imported %(updated)d of %(processed)d line in %(seconds).1f seconds.',
+                    'Imported %(updated)d of %(processed)d lines in %(seconds).1f seconds.',
+                    result.processed,
+                ) % {'updated': result.updated, 'processed': result.processed, 'seconds': time.monotonic() - started},
+                messages.SUCCESS,
+            )
+            if result.failed:
+                self.message_user(
+                    request,
+                    ngettext(
+                        '%(failed)d line was skipped: %(failures)s',
+                        '%(failed)d lines were skipped: %(failures)s',
+                        result.failed,
+                    ) % {
+                        'failed': result.failed,
+                        'failures': '; '.join('line {}: {}'.format(*failure) for failure in result.failures),
+                    },
+                    messages.WARNING,
+                )
+            return HttpResponseRedirect(
+                reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist', current_app=self.admin_site.name)
+            )
+
+        context = {
+            **self.admin_site.each_context(request),
+            'title': _('Import NDJSON'),
+            'subtitle': None,
+            'opts': opts,
+            'form': form,
+            'media': self.media,
+        }
+        request.current_app = self.admin_site.name
+        return TemplateResponse(request, 'django_json_widget/import_ndjson.html', context)
+
+
+def _truncate(text, length):
+    if len(text) <= length:
+        return text
+    return text[:length - 1] + '…'
+
+
+def _key_transform(field_name, key_path):
+    expression = F(field_name)
+    for key in key_path.split('__'):
+        expression = KeyTransform(key, expression)
+    return expression
+
+
+def json_preview(field_name, key_path=None, description=None, length=60, link=True, precomputed=False):
+    """
+    Return a ``list_display`` column showing a truncated preview of a JSON
+    field, either of the value at ``key_path`` (keys separated by ``__``, as
+    in queryset lookups) or of the whole document.
+
+    Used on a ``JSONPreviewMixin`` admin, the value is extracted (or the
+    document truncated) by the database and the full field is deferred, so
+    the changelist never loads whole documents. Elsewhere the column falls
+    back to reading the document from the object. With ``link`` the preview
+    links to the change form, where the document can be edited in full.
+
+    With ``precomputed``, a whole-document preview is read from the artefacts
+    stored by the ``precompute_json`` command instead (documents without an
+    entry are loaded in one query); such a column is not sortable.
+    """
+    alias = '{}_{}_preview'.format(field_name, (key_path or 'document').replace('__', '_'))
+    if precomputed and (key_path or length > PREVIEW_LENGTH):
+        raise ValueError(f'Precomputed previews cover whole documents up to {PREVIEW_LENGTH} characters.')
+    if precomputed:
+        expression = None
+    elif key_path:
+        expression = _key_transform(field_name, key_path)
+    else:
+        # Extract one character more than shown, so truncation can be told
+        # apart from a document that happens to fit.
+        expression = Substr(Cast(F(field_name), TextField()), 1, length + 1)
+
+    def column(obj):
+        if hasattr(obj, alias):
+            value = getattr(obj, alias)
+        else:
+            value = getattr(obj, field_name)
+            for key in (key_path.split('__') if key_path else ()):
+                try:
+                    value = value[int(key) if isinstance(value, list) else key]
+                except (KeyError, IndexError, TypeError, ValueError):
+                    value = None
+                    break
+        if value is None:
+            return None
+
+        if key_path or not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False)
+        preview = _truncate(value, length)
+        if not link:
+            return preview
+        opts = obj._meta
+        try:
+            url = reverse(f'admin:{opts.app_label}_{opts.model_name}_change', args=[quote(obj.pk)])
+        except NoReverseMatch:
+            return preview
+        return format_html('<a href="{}">{}</a>', url, preview)
+
+    column.json_preview = (field_name, alias, expression)
+    column.__name__ = alias
+    return admin.display(
+        description=description or key_path or field_name,
+        ordering=None if precomputed else alias,
+    )(column)
+
+
+class JSONPreviewChangeList(ChangeList):
+    previews_applied = False
+
+    def get_queryset(self, request, *args, **kwargs):
+        # Annotate the root queryset, so ordering by a preview column can
+        # refer to its annotation.
+        if not self.previews_applied:
+            self.root_queryset = self.apply_previews(self.root_queryset)
+            self.previews_applied = True
+        return super().get_queryset(request, *args, **kwargs)
+
+    def apply_previews(self, queryset):
+        previews = [column.json_preview for column in self.list_display if hasattr(column, 'json_preview')]
+        if not previews:
+            return queryset
+
+        annotations = {alias: expression for _field, alias, expression in previews if expression is not None}
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        shown = {name for name in self.list_display if isinstance(name, str)} | set(self.list_editable)
+        deferred = {field for field, _alias, _expression in previews} - shown
+        return queryset.defer(*deferred) if deferred else queryset
+
+    def get_results(self, request):
+        super().get_results(request)
+        for column in self.list_display:
+            field_name, alias, expression = getattr(column, 'json_preview', (None, None, None))
+            if field_name and expression is None:
+                self.apply_precomputed(field_name, alias)
+
+    def apply_precomputed(self, field_name, alias):
+        """
+        Set ``alias`` on the page's objects to their precomputed preview,
+        loading the documents that have none in one query.
+        """
+        objs = {obj.pk: obj for obj in self.result_list}
+        artefacts = get_precomputed(self.model, field_name, list(objs))
+        previews = {pk: entry['preview'] for pk, entry in artefacts.items()}
+        missing = [pk for pk in objs if pk not in previews]
+        if missing:
+            documents = self.model._default_manager.filter(pk__in=missing).values_list('pk', field_name)
+            for pk, value in documents:
+                previews[pk] = json.dumps(value, ensure_ascii=False)[:PREVIEW_LENGTH + 1]
+        for pk, obj in objs.items():
+            setattr(obj, alias, previews.get(pk))
+
+
+class JSONPreviewMixin:
+    """
+    ``ModelAdmin`` mixin making ``json_preview`` columns extract their values
+    in the database and defer the JSON fields they preview, so the cost of
+    the changelist does not depend on the size of the documents.
+    """
+
+    def get_changelist(self, _request, **_kwargs):
+        return JSONPreviewChangeList
@@ -1,6 +1,27 @@
 # -*- coding: utf-8
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
+from django.db.models.signals import post_delete, post_save
+
+
+def _drop_precomputed(sender, instance, **_kwargs):
+    from .models import json_field_names
+    from .precompute import invalidate
+
+    invalidate(sender, json_field_names(sender), [instance.pk])
 
 
 class DjangoJsonWidgetConfig(AppConfig):
     name = 'django_json_widget'
+    default_auto_field = 'django.db.models.AutoField'
+
+    def ready(self):
+        from .models import json_field_names
+
+        # Precomputed artefacts describe the stored document; drop them
+        # whenever it may have changed. Only models with JSON fields can have
+        # any, and ``invalidate`` skips models that are not precomputed.
+        for model in apps.get_models():
+            if model._meta.app_label != self.label and json_field_names(model):
+                uid = f'django_json_widget.precomputed.{model._meta.label_lower}'
+                post_save.connect(_drop_precomputed, sender=model, dispatch_uid=uid + '.save')
+                post_delete.connect(_drop_precomputed, sender=model, dispatch_uid=uid + '.delete')
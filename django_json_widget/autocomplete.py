@@ -0,0 +1,157 @@
+"""
+Key and value suggestions for ``JSONEditorWidget``, drawn from existing data.
+
+An index of the keys found at each path of a model's JSON field, and of the
+most common string values, is built from a sample of rows read with
+``.iterator()``. The counts live in the Django cache; every
+``JSON_EDITOR_AUTOCOMPLETE_TTL`` seconds only rows added since (by primary
+key) are scanned and merged in, and the whole entry expires after
+``JSON_EDITOR_AUTOCOMPLETE_REBUILD`` seconds to pick up edits. Each process
+keeps sorted copies of the lists to answer prefix queries with ``bisect``,
+and reuses them without reading the cache until they are older than the TTL.
+"""
+import bisect
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import json_field_names
+
+SAMPLE_SIZE = 5000
+CHUNK_SIZE = 500
+MAX_DEPTH = 10
+# Distinct keys and values tracked per path, and values kept for
+# suggestions. Objects past the key cap are not walked into.
+MAX_TRACKED_KEYS = 1000
+MAX_TRACKED_VALUES = 1000
+MAX_SUGGESTED_VALUES = 200
+MAX_VALUE_LENGTH = 200
+
+# Sorted structures derived from the cached counts, per process.
+_sorted = {}
+
+
+def _settings():
+    return (
+        getattr(settings, 'JSON_EDITOR_AUTOCOMPLETE_TTL', 300),
+        getattr(settings, 'JSON_EDITOR_AUTOCOMPLETE_REBUILD', 24 * 60 * 60),
+        getattr(settings, 'JSON_EDITOR_AUTOCOMPLETE_SAMPLE_SIZE', SAMPLE_SIZE),
+    )
+
+
+def normalize_path(path):
+    """Array positions all share one ``'*'`` entry in the index."""
+    return tuple('*' if isinstance(step, int) else str(step) for step in path)
+
+
+def _walk(value, path, keys, values, depth=0):
+    if depth > MAX_DEPTH:
+        return
+    if isinstance(value, dict):
+        counter = keys.setdefault(path, Counter())
+        for key, child in value.items():
+            if key in counter or len(counter) < MAX_TRACKED_KEYS:
+                counter[key] += 1
+                _walk(child, (*path, key), keys, values, depth + 1)
+    elif isinstance(value, list):
+        for child in value:
+            _walk(child, (*path, '*'), keys, values, depth + 1)
+    elif isinstance(value, str) and len(value) <= MAX_VALUE_LENGTH:
+        counter = values.setdefault(path, Counter())
+        if value in counter or len(counter) < MAX_TRACKED_VALUES:
+            counter[value] += 1
+
+
+def _scan(state, queryset, field_name, sample_size):
+    pk_name = queryset.model._meta.pk.name
+    if state['max_pk'] is not None:
+        queryset = queryset.filter(pk__gt=state['max_pk'])
+    # Sample the most recent rows.
+    rows = queryset.order_by('-' + pk_name).values_list(pk_name, field_name)[:sample_size]
+    for pk, document in rows.iterator(chunk_size=CHUNK_SIZE):
+        if state['max_pk'] is None or pk > state['max_pk']:
+            state['max_pk'] = pk
+        state['rows'] += 1
+        _walk(document, (), state['keys'], state['values'])
+    state['refreshed'] = time.time()
+    return state
+
+
+def _cache_key(label, field_name):
+    return f'django_json_widget:autocomplete:{label.lower()}.{field_name}'
+
+
+def get_state(model, field_name):
+    """
+    Return the cached counts for a model field, refreshing them with new rows
+    when older than the TTL and rebuilding them once they expire.
+    """
+    ttl, rebuild, sample_size = _settings()
+    key = _cache_key(model._meta.label, field_name)
+    state = cache.get(key)
+    if state is None:
+        state = {'max_pk': None, 'rows': 0, 'keys': {}, 'values': {}, 'refreshed': 0, 'created': time.time()}
+    elif time.time() - state['refreshed'] < ttl:
+        return state
+    _scan(state, model._default_manager.all(), field_name, sample_size)
+    remaining = rebuild - (time.time() - state['created'])
+    cache.set(key, state, max(int(remaining), 1))
+    return state
+
+
+def _sorted_lists(model, field_name):
+    key = (model._meta.label, field_name)
+    cached = _sorted.get(key)
+    if cached is not None and time.time() - cached[0] < _settings()[0]:
+        return cached[1], cached[2]
+    state = get_state(model, field_name)
+    if cached is None or cached[0] != state['refreshed']:
+        keys = {path: sorted(counter) for path, counter in state['keys'].items()}
+        values = {
+            path: sorted(value for value, _count in counter.most_common(MAX_SUGGESTED_VALUES))
+            for path, counter in state['values'].items()
+        }
+        cached = _sorted[key] = (state['refreshed'], keys, values)
+    return cached[1], cached[2]
+
+
+def _prefixed(items, prefix, limit):
+    start = bisect.bisect_left(items, prefix)
+    results = []
+    for item in items[start:start + limit]:
+        if not item.startswith(prefix):
+            break
+        results.append(item)
+    return results
+
+
+def suggest(model, field_name, kind, path, prefix='', limit=20):
+    """
+    Return up to ``limit`` keys (``kind='key'``) found in objects at ``path``,
+    or common string values (``kind='value'``) found at ``path``, starting
+    with ``prefix``. ``path`` is a list of keys and array indexes.
+    """
+    keys, values = _sorted_lists(model, field_name)
+    path = normalize_path(path)
+    if kind == 'key':
+        # jsoneditor passes the path of the member being renamed.
+        return _prefixed(keys.get(path[:-1], []), prefix, limit)
+    return _prefixed(values.get(path, []), prefix, limit)
+
+
+def get_field_model(label):
+    """
+    Resolve ``'app_label.model_name.field_name'`` to ``(model, field_name)``,
+    raising ``LookupError`` for anything but a JSON field.
+    """
+    try:
+        app_label, model_name, field_name = label.split('.')
+    except ValueError:
+        raise LookupError(label) from None
+    model = apps.get_model(app_label, model_name)
+    if field_name not in json_field_names(model):
+        raise LookupError(label)
+    return model, field_name
@@ -0,0 +1,136 @@
+import copy
+
+import django
+from django import forms
+from django.core.exceptions import ValidationError
+from django.forms.boundfield import BoundField
+from django.forms.fields import JSONString
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+from .models import json_field_names
+from .parsing import LimitExceeded, check_limits
+from .precompute import get_precomputed
+from .schema import get_schema
+from .widgets import (
+    InvalidCompressedInput,
+    JSONEditorModalWidget,
+    JSONEditorWidget,
+    PrecomputedValue,
+    UnchangedValue,
+)
+
+
+class JSONEditorBoundField(BoundField):
+    @cached_property
+    def data(self):
+        """
+        Resolve a verified "unchanged" marker to the initial value itself, so
+        neither cleaning nor ``has_changed`` has to parse the document. The
+        marker is checked once per bound field, as it hashes the document.
+        """
+        data = super().data
+        if isinstance(data, UnchangedValue) and data.matches(self.field.prepare_value(self.initial)):
+            if isinstance(self.initial, str):
+                return JSONString(self.initial)
+            return self.initial
+        return data
+
+    def value(self):
+        """
+        Attach the artefacts precomputed for a model form's stored document,
+        which the widget displays as a summary.
+        """
+        value = super().value()
+        instance = getattr(self.form, 'instance', None)
+        if (
+            self.form.is_bound or not isinstance(value, str) or instance is None or instance.pk is None
+            or self.name not in json_field_names(type(instance))
+        ):
+            return value
+        artefacts = get_precomputed(type(instance), self.name, [instance.pk]).get(instance.pk)
+        return PrecomputedValue(value, artefacts) if artefacts else value
+
+    def as_widget(self, widget=None, attrs=None, only_initial=False):
+        """
+        Hand the schema registered for a model form's field (see
+        ``django_json_widget.schema``) to a widget that has none.
+        """
+        widget = widget or self.field.widget
+        instance = getattr(self.form, 'instance', None)
+        if (
+            isinstance(widget, JSONEditorWidget) and widget.schema is None and instance is not None
+            and self.name in json_field_names(type(instance))
+        ):
+            schema = get_schema(type(instance), self.name)
+            if schema is not None:
+                widget = copy.copy(widget)
+                widget.schema = schema
+        return super().as_widget(widget, attrs, only_initial)
+
+
+class JSONEditorField(forms.JSONField):
+    """
+    A ``JSONField`` form field using ``JSONEditorWidget`` which lets the
+    browser skip posting documents the user did not edit.
+
+    ``max_bytes``, ``max_depth`` and ``max_nodes`` bound the submitted
+    document; they are checked before the text is parsed.
+    """
+    widget = JSONEditorWidget
+    default_error_messages = {  # noqa: RUF012
+        'unchanged_mismatch': _('The stored value has changed since this form was loaded. Please reload the page.'),
+        'max_bytes': _('Ensure this document is at most %(limit)s bytes (it has %(value)s).'),
+        'max_depth': _('Ensure this document is nested at most %(limit)s levels deep.'),
+        'max_nodes': _('Ensure this document has at most %(limit)s values.'),
+        'max_decompressed_size': _('The submitted document is too large once decompressed.'),
+        'invalid_compressed': _('The submitted document could not be decompressed.'),
+    }
+
+    def __init__(self, max_bytes=None, max_depth=None, max_nodes=None, **kwargs):
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        super().__init__(**kwargs)
+        # Forms only clean through ``BoundField.data`` since Django 4.0, and
+        # the modal widget's cells carry no marker.
+        if (
+            isinstance(self.widget, JSONEditorWidget) and not isinstance(self.widget, JSONEditorModalWidget)
+            and django.VERSION >= (4, 0)
+        ):
+            self.widget.unchanged_marker = True
+            # Model fields with a callable default ask for a hidden copy of
+            # the initial value, which would post the whole document anyway.
+            self.show_hidden_initial = False
+
+    def get_bound_field(self, form, field_name):
+        return JSONEditorBoundField(form, self, field_name)
+
+    def to_python(self, value):
+        if isinstance(value, UnchangedValue):
+            # Only reached when the marker is forged or stale.
+            raise ValidationError(self.error_messages['unchanged_mismatch'], code='unchanged_mismatch')
+        if isinstance(value, InvalidCompressedInput):
+            raise ValidationError(self.error_messages[value.code], code=value.code)
+        if isinstance(value, str) and not isinstance(value, JSONString) and not self.disabled:
+            try:
+                check_limits(value, self.max_bytes, self.max_depth, self.max_nodes)
+            except LimitExceeded as e:
+                raise ValidationError(
+                    self.error_messages[e.code],
+                    code=e.code,
+                    params={'limit': e.limit, 'value': e.value},
+                ) from e
+        return super().to_python(value)
+
+    def bound_data(self, data, initial):
+        # A resolved marker leaves the initial value itself in ``data``, and an
+        # undecodable compressed submission has nothing worth redisplaying.
+        if isinstance(data, (JSONString, InvalidCompressedInput)) or (data is not None and not isinstance(data, str)):
+            return initial
+        return super().bound_data(data, initial)
+
+    def has_changed(self, initial, data):
+        if data is initial:
+            return False
+        return super().has_changed(initial, data)
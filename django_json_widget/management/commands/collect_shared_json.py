@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from django_json_widget.models import collect_shared_json
+
+
+class Command(BaseCommand):
+    help = 'Delete shared JSON documents no SharedJSONField refers to anymore.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace', type=int, default=3600,
+            help='Keep documents stored or saved again within this many seconds (default: 3600).',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *_args, **options):
+        count = collect_shared_json(timedelta(seconds=options['grace']), using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Deleted {count} unused shared JSON documents.'))
@@ -0,0 +1,45 @@
+import json
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from django_json_widget.models import json_field_names
+from django_json_widget.schema import DEFAULT_CHUNK_SIZE, infer_schema, register_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Infer a JSON Schema from the documents stored in a model's JSON field and register it, so "
+        "JSONEditorWidget validates against it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. app_label.ModelName.')
+        parser.add_argument('field', help='JSON field name.')
+        parser.add_argument('--sample', type=int, help='Scan this many random rows instead of all of them.')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--print', action='store_true', dest='print_schema', help='Print the inferred schema.')
+        parser.add_argument('--dry-run', action='store_true', help='Do not register the schema.')
+
+    def handle(self, *_args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        if options['field'] not in json_field_names(model):
+            raise CommandError('{} is not a JSON field of {}.'.format(options['field'], model._meta.label))
+
+        schema, report = infer_schema(
+            model._default_manager.all(),
+            options['field'],
+            sample=options['sample'],
+            chunk_size=options['chunk_size'],
+        )
+        if not options['dry_run']:
+            register_schema(model, options['field'], schema, report)
+        if options['print_schema']:
+            self.stdout.write(json.dumps(schema, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f'Scanned {report.rows} rows ({report.characters / 1024 / 1024:.1f} MiB of JSON) '
+            f'in {report.seconds:.2f} seconds.'
+        ))
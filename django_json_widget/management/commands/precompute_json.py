@@ -0,0 +1,68 @@
+import os
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from django_json_widget.models import json_field_names
+from django_json_widget.precompute import DEFAULT_CHUNK_SIZE, get_store, is_precomputed, precompute
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute size summaries, top-level keys, digests and previews of a model's JSON fields in worker "
+        "processes, and store them for the widget and json_preview columns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. app_label.ModelName.')
+        parser.add_argument('--field', action='append', dest='fields', help='JSON field (default: all of them).')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Worker processes (default: one per CPU); 0 computes in this process.',
+        )
+        parser.add_argument(
+            '--resume', action='store_true',
+            help='Skip rows that already have artefacts without hashing them, to finish an interrupted run.',
+        )
+
+    def handle(self, *_args, **options):
+        store = get_store()
+        if store is None:
+            raise CommandError('Set JSON_EDITOR_PRECOMPUTE_STORE to "cache" or "table" first.')
+        if store.per_process:
+            self.stderr.write(self.style.WARNING(
+                'The default cache backend is per process, so artefacts stored by this command are not seen by the '
+                'web server. Use a shared cache backend or JSON_EDITOR_PRECOMPUTE_STORE = "table".'
+            ))
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e)) from e
+        if not is_precomputed(model):
+            raise CommandError(
+                f'{model._meta.label} is not in JSON_EDITOR_PRECOMPUTE_MODELS, so its artefacts would never be '
+                'invalidated.'
+            )
+
+        available = json_field_names(model)
+        fields = options['fields'] or available
+        unknown = set(fields) - set(available)
+        if unknown:
+            raise CommandError('Not JSON fields of {}: {}.'.format(model._meta.label, ', '.join(sorted(unknown))))
+
+        def progress(result):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{result.processed} rows, {result.computed} computed, {result.skipped} skipped')
+
+        result = precompute(
+            model._default_manager.all(),
+            fields,
+            chunk_size=options['chunk_size'],
+            workers=options['workers'],
+            resume=options['resume'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {result.processed} rows: {result.computed} artefacts computed, {result.skipped} skipped.'
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrecomputedJSON',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('field', models.CharField(max_length=100)),
+                ('object_pk', models.CharField(max_length=255)),
+                ('digest', models.CharField(max_length=64)),
+                ('artefacts', models.JSONField()),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'precomputed JSON artefacts',
+                'verbose_name_plural': 'precomputed JSON artefacts',
+                'unique_together': {('model', 'field', 'object_pk')},
+            },
+        ),
+    ]
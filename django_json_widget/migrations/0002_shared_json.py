@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:25
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_json_widget', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SharedJSON',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content', models.TextField()),
+                ('touched', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'shared JSON document',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('django_json_widget', '0002_shared_json'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InferredSchema',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('field', models.CharField(max_length=100)),
+                ('schema', models.JSONField()),
+                ('report', models.JSONField(null=True)),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('model', 'field')},
+            },
+        ),
+    ]
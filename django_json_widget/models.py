@@ -1 +1,464 @@
 # -*- coding: utf-8 -*-
+import hashlib
+import json
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core import checks
+from django.db import migrations, models
+from django.db.models.query_utils import DeferredAttribute
+from django.utils import timezone
+
+try:
+    from compression import zstd  # Python 3.14+
+except ImportError:
+    try:
+        import zstandard as zstd
+    except ImportError:
+        zstd = None
+
+
+def json_field_names(model):
+    """Return the names of the concrete JSON fields of ``model``."""
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, models.JSONField)]
+
+
+# The first byte of a stored value names its encoding.
+PLAIN = b'\x00'
+ZLIB = b'\x01'
+ZSTD = b'\x02'
+ALGORITHMS = {'zlib': ZLIB, 'zstd': ZSTD}
+
+
+def _compress(data, algorithm, level):
+    if algorithm == 'zstd':
+        return zstd.compress(data, level)
+    return zlib.compress(data, level)
+
+
+def _decompress(payload):
+    header, data = payload[:1], payload[1:]
+    if header == PLAIN:
+        return data
+    if header == ZLIB:
+        return zlib.decompress(data)
+    if header == ZSTD:
+        if zstd is None:
+            raise RuntimeError('Install "zstandard" to read zstd compressed JSON.')
+        return zstd.decompress(data)
+    raise ValueError(f'Unknown compressed JSON header {header!r}.')
+
+
+class CompressedJSON:
+    """
+    A stored ``CompressedJSONField`` value that has not been decoded yet.
+
+    Model instances decode it on first attribute access; ``values()`` and
+    ``values_list()`` return it as is, and ``load()`` decodes it.
+    """
+    __slots__ = ('decoder', 'payload')
+
+    def __init__(self, payload, decoder=None):
+        self.payload = payload
+        self.decoder = decoder
+
+    def __len__(self):
+        return len(self.payload)
+
+    def __repr__(self):
+        return f'<CompressedJSON: {len(self.payload)} bytes>'
+
+    def load(self):
+        return json.loads(_decompress(self.payload), cls=self.decoder)
+
+
+class LazyJSONDescriptor(DeferredAttribute):
+    """
+    Decode a stored ``CompressedJSON`` or ``SharedJSONRef`` on first access
+    and keep the decoded document on the instance.
+    """
+    # A data descriptor, so reads go through ``__get__`` even once loaded.
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, (CompressedJSON, SharedJSONRef)):
+            value = instance.__dict__[self.field.attname] = value.load()
+        return value
+
+
+class CompressedJSONField(models.BinaryField):
+    """
+    A JSON document stored compressed in a binary column.
+
+    Documents whose UTF-8 encoding reaches ``threshold`` bytes are compressed
+    with ``algorithm`` (``'zlib'``, or ``'zstd'`` with the ``zstandard``
+    package or Python 3.14+) at ``level``; smaller ones, and ones that do not
+    shrink, are stored as is. Values are decoded on first attribute access, and
+    an untouched value is saved back without being re-encoded. The column
+    cannot be queried into like a ``JSONField``.
+    """
+    description = 'A JSON object stored compressed'
+    descriptor_class = LazyJSONDescriptor
+    empty_strings_allowed = False
+    empty_values = (None,)
+
+    def __init__(self, *args, algorithm='zlib', threshold=256, level=6, encoder=None, decoder=None, **kwargs):
+        self.algorithm = algorithm
+        self.threshold = threshold
+        self.level = level
+        self.encoder = encoder
+        self.decoder = decoder
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def check(self, **kwargs):
+        errors = super().check(**kwargs)
+        if self.algorithm not in ALGORITHMS:
+            errors.append(checks.Error(
+                f"'algorithm' must be one of: {', '.join(sorted(ALGORITHMS))}.",
+                obj=self,
+                id='django_json_widget.E001',
+            ))
+        elif self.algorithm == 'zstd' and zstd is None:
+            errors.append(checks.Error(
+                "zstd compression requires the 'zstandard' package.",
+                obj=self,
+                id='django_json_widget.E002',
+            ))
+        return errors
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        # Unlike ``BinaryField``, editable by default.
+        if kwargs.pop('editable', False) is False:
+            kwargs['editable'] = False
+        if self.algorithm != 'zlib':
+            kwargs['algorithm'] = self.algorithm
+        if self.threshold != 256:
+            kwargs['threshold'] = self.threshold
+        if self.level != 6:
+            kwargs['level'] = self.level
+        if self.encoder is not None:
+            kwargs['encoder'] = self.encoder
+        if self.decoder is not None:
+            kwargs['decoder'] = self.decoder
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, _expression, _connection):
+        if value is None:
+            return value
+        return CompressedJSON(bytes(value), self.decoder)
+
+    def to_python(self, value):
+        if isinstance(value, CompressedJSON):
+            return value.load()
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, CompressedJSON):
+            return value
+        return super().pre_save(model_instance, add)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, CompressedJSON):
+            return value.payload
+        data = json.dumps(value, cls=self.encoder).encode('utf-8')
+        if len(data) >= self.threshold:
+            compressed = _compress(data, self.algorithm, self.level)
+            if len(compressed) < len(data):
+                return ALGORITHMS[self.algorithm] + compressed
+        return PLAIN + data
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        from .forms import JSONEditorField
+
+        return models.Field.formfield(self, **{
+            'form_class': JSONEditorField,
+            'encoder': self.encoder,
+            'decoder': self.decoder,
+            **kwargs,
+        })
+
+
+def canonical_json(value, encoder=None):
+    """Serialize ``value`` with sorted keys and compact separators."""
+    return json.dumps(value, cls=encoder, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+
+class SharedJSON(models.Model):
+    """
+    A distinct document stored once for every ``SharedJSONField`` row holding
+    it, keyed by the SHA-256 of its canonical JSON. Rows are never changed;
+    ``collect_shared_json`` deletes the ones nothing refers to.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    content = models.TextField()
+    touched = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = 'shared JSON document'
+
+    def __str__(self):
+        return self.digest
+
+
+class DocumentCache:
+    """A thread-safe LRU cache of canonical JSON texts by digest."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest):
+        with self.lock:
+            content = self.entries.get(digest)
+            if content is not None:
+                self.entries.move_to_end(digest)
+            return content
+
+    def set(self, digest, content):
+        with self.lock:
+            self.entries[digest] = content
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+shared_documents = DocumentCache(getattr(settings, 'JSON_EDITOR_SHARED_CACHE_SIZE', 256))
+
+
+def load_shared(digests, using=None):
+    """
+    Return ``{digest: content}`` for ``digests``, fetching the documents
+    missing from the cache in one query. Unknown digests are left out.
+    """
+    contents = {}
+    missing = set()
+    for digest in digests:
+        content = shared_documents.get(digest)
+        if content is None:
+            missing.add(digest)
+        else:
+            contents[digest] = content
+    if missing:
+        rows = SharedJSON.objects.using(using).filter(digest__in=missing).values_list('digest', 'content')
+        for digest, content in rows:
+            shared_documents.set(digest, content)
+            contents[digest] = content
+    return contents
+
+
+class SharedJSONRef:
+    """
+    The digest of a ``SharedJSONField`` value that has not been loaded yet.
+
+    Model instances load it on first attribute access; ``values()`` and
+    ``values_list()`` return it as is, and ``load()`` decodes it.
+    """
+    __slots__ = ('decoder', 'digest', 'using')
+
+    def __init__(self, digest, decoder=None, using=None):
+        self.digest = digest
+        self.decoder = decoder
+        self.using = using
+
+    def __repr__(self):
+        return f'<SharedJSONRef: {self.digest}>'
+
+    def load(self):
+        content = load_shared([self.digest], self.using).get(self.digest)
+        if content is None:
+            raise SharedJSON.DoesNotExist(f'Shared JSON document {self.digest} does not exist.')
+        # Every caller gets its own copy, so editing one object never changes
+        # another sharing the document.
+        return json.loads(content, cls=self.decoder)
+
+
+class SharedJSONField(models.Field):
+    """
+    A JSON document stored once per distinct content in the ``SharedJSON``
+    table, the column holding the SHA-256 digest of its canonical JSON
+    (sorted keys, compact separators).
+
+    Saving a changed document stores a new shared row and points this one at
+    it, so rows sharing the previous document are unaffected. Documents are
+    loaded on first attribute access through a per-process LRU cache of
+    ``JSON_EDITOR_SHARED_CACHE_SIZE`` entries, and come back with their keys
+    sorted. Filtering on a whole document (``field=value``) compares digests.
+
+    The column is a ``CharField`` one, but none of its validation applies to
+    the document.
+    """
+    description = 'A JSON object stored once per distinct content'
+    descriptor_class = LazyJSONDescriptor
+    empty_strings_allowed = False
+
+    def __init__(self, *args, encoder=None, decoder=None, **kwargs):
+        self.encoder = encoder
+        self.decoder = decoder
+        kwargs['max_length'] = 64
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def get_internal_type(self):
+        return 'CharField'
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['max_length']
+        if kwargs.pop('db_index', False) is False:
+            kwargs['db_index'] = False
+        if self.encoder is not None:
+            kwargs['encoder'] = self.encoder
+        if self.decoder is not None:
+            kwargs['decoder'] = self.decoder
+        return name, path, args, kwargs
+
+    def from_db_value(self, value, _expression, connection):
+        if value is None:
+            return value
+        return SharedJSONRef(value, self.decoder, connection.alias)
+
+    def to_python(self, value):
+        if isinstance(value, SharedJSONRef):
+            return value.load()
+        return value
+
+    def pre_save(self, model_instance, add):
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, SharedJSONRef):
+            return value
+        return super().pre_save(model_instance, add)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, SharedJSONRef):
+            return value.digest
+        return hashlib.sha256(canonical_json(value, self.encoder).encode('utf-8')).hexdigest()
+
+    def get_db_prep_save(self, value, connection):
+        if value is None or isinstance(value, SharedJSONRef):
+            return super().get_db_prep_save(value, connection)
+        content = canonical_json(value, self.encoder)
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        # Mark the document as used, so a concurrent garbage collection keeps
+        # it, or store it.
+        shared = SharedJSON.objects.using(connection.alias)
+        if not shared.filter(digest=digest).update(touched=timezone.now()):
+            shared.bulk_create([SharedJSON(digest=digest, content=content)], ignore_conflicts=True)
+        shared_documents.set(digest, content)
+        return digest
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
+
+    def formfield(self, **kwargs):
+        from .forms import JSONEditorField
+
+        return models.Field.formfield(self, **{
+            'form_class': JSONEditorField,
+            'encoder': self.encoder,
+            'decoder': self.decoder,
+            **kwargs,
+        })
+
+
+def collect_shared_json(grace=timedelta(hours=1), using=None):
+    """
+    Delete the ``SharedJSON`` documents no ``SharedJSONField`` refers to and
+    that were not stored or saved again within ``grace``. Returns the number
+    of documents deleted.
+    """
+    unused = SharedJSON.objects.using(using).filter(touched__lt=timezone.now() - grace)
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, SharedJSONField):
+                referenced = model._base_manager.using(using).exclude(**{field.attname: None})
+                unused = unused.exclude(digest__in=referenced.values(field.attname))
+    count, _deleted = unused.delete()
+    return count
+
+
+def copy_json_field(app_label, model_name, from_field, to_field, chunk_size=500):
+    """
+    Return a ``RunPython`` operation copying every document of ``from_field``
+    to ``to_field`` (and back when unapplied), ``chunk_size`` rows at a time,
+    to convert a ``JSONField`` into a ``CompressedJSONField`` or vice versa.
+    """
+    def copy(source, target):
+        def run(apps, schema_editor):
+            model = apps.get_model(app_label, model_name)
+            manager = model._base_manager.db_manager(schema_editor.connection.alias)
+            rows = manager.order_by('pk').values_list('pk', source).iterator(chunk_size=chunk_size)
+            batch = []
+            for pk, value in rows:
+                if isinstance(value, CompressedJSON):
+                    value = value.load()
+                batch.append(model(pk=pk, **{target: value}))
+                if len(batch) >= chunk_size:
+                    manager.bulk_update(batch, [target])
+                    batch = []
+            if batch:
+                manager.bulk_update(batch, [target])
+        return run
+
+    return migrations.RunPython(copy(from_field, to_field), copy(to_field, from_field))
+
+
+class PrecomputedJSON(models.Model):
+    """
+    Artefacts of one document computed by the ``precompute_json`` command,
+    when ``JSON_EDITOR_PRECOMPUTE_STORE`` is ``'table'``.
+    """
+    model = models.CharField(max_length=100)
+    field = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=255)
+    digest = models.CharField(max_length=64)
+    artefacts = models.JSONField()
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('model', 'field', 'object_pk'),)
+        verbose_name = 'precomputed JSON artefacts'
+        verbose_name_plural = 'precomputed JSON artefacts'
+
+    def __str__(self):
+        return f'{self.model}.{self.field}:{self.object_pk}'
+
+
+class InferredSchema(models.Model):
+    """
+    A JSON Schema registered for a model field, usually by the
+    ``infer_json_schema`` command.
+    """
+    model = models.CharField(max_length=100)
+    field = models.CharField(max_length=100)
+    schema = models.JSONField()
+    report = models.JSONField(null=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = (('model', 'field'),)
+
+    def __str__(self):
+        return f'{self.model}.{self.field}'
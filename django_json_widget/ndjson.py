@@ -0,0 +1,123 @@
+"""
+Streaming NDJSON (newline delimited JSON) export and import of JSON fields.
+
+Each line holds one object: its primary key under ``"pk"`` and one member
+per JSON field, e.g. ``{"pk": 1, "data": {...}}``.
+"""
+import json
+import logging
+from collections import namedtuple
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .precompute import invalidate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_FAILURES = 20
+# Lines are buffered into writes of about this many characters, to keep
+# the number of chunks handed to the server reasonable for small rows.
+WRITE_BUFFER_SIZE = 64 * 1024
+
+ImportResult = namedtuple('ImportResult', 'processed updated failed failures')
+
+
+def iter_ndjson(queryset, field_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield the NDJSON export of ``field_names`` for every row of ``queryset``.
+
+    Rows are read with ``.iterator()`` and encoded one at a time, so memory
+    use depends on the largest document rather than the number of rows.
+    """
+    pk_name = queryset.model._meta.pk.name
+    rows = queryset.order_by(pk_name).values_list(pk_name, *field_names).iterator(chunk_size=chunk_size)
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    buffer, size = [], 0
+    for row in rows:
+        record = {'pk': row[0], **dict(zip(field_names, row[1:]))}
+        line = encoder.encode(record) + '\n'
+        buffer.append(line)
+        size += len(line)
+        if size >= WRITE_BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _parse_line(line, pk_field, field_names):
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    record = json.loads(line)
+    if not isinstance(record, dict) or 'pk' not in record:
+        raise ValueError('Expected an object with a "pk" member.')
+    pk = pk_field.to_python(record.pop('pk'))
+    unknown = set(record) - set(field_names)
+    if unknown:
+        raise ValueError('Unknown fields: {}.'.format(', '.join(sorted(unknown))))
+    if not record:
+        raise ValueError('No fields to update.')
+    return pk, record
+
+
+def import_ndjson(lines, queryset, field_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Update the rows of ``queryset`` from NDJSON ``lines`` (an iterable of
+    ``str`` or ``bytes`` such as an uploaded file).
+
+    Lines are parsed one at a time and validated; every ``chunk_size`` valid
+    lines, the matching rows are written with ``bulk_update``. Lines that are
+    malformed, name unknown fields or refer to rows outside ``queryset`` are
+    skipped and reported in ``failures`` as ``(line number, message)``.
+    """
+    model = queryset.model
+    pk_field = model._meta.pk
+    processed = updated = failed = 0
+    failures = []
+    batch = []
+
+    def fail(number, message):
+        nonlocal failed
+        failed += 1
+        if len(failures) < MAX_REPORTED_FAILURES:
+            failures.append((number, message))
+
+    def flush():
+        existing = set(queryset.filter(pk__in=[pk for _number, pk, _record in batch]).values_list('pk', flat=True))
+        by_fields = {}
+        for number, pk, record in batch:
+            if pk not in existing:
+                fail(number, f'Object {pk!r} does not exist.')
+                continue
+            obj = model(**{pk_field.attname: pk})
+            for name, value in record.items():
+                setattr(obj, name, value)
+            by_fields.setdefault(tuple(sorted(record)), []).append(obj)
+        count = 0
+        for fields, objs in by_fields.items():
+            model._default_manager.bulk_update(objs, fields, batch_size=chunk_size)
+            invalidate(model, fields, [obj.pk for obj in objs])
+            count += len(objs)
+        batch.clear()
+        return count
+
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        processed += 1
+        try:
+            pk, record = _parse_line(line, pk_field, field_names)
+        except (ValueError, ValidationError) as e:
+            fail(number, e.messages[0] if isinstance(e, ValidationError) else str(e))
+            continue
+        batch.append((number, pk, record))
+        if len(batch) >= chunk_size:
+            updated += flush()
+            logger.info('NDJSON import of %s: %d lines processed, %d updated', model._meta.label, processed, updated)
+
+    if batch:
+        updated += flush()
+    return ImportResult(processed, updated, failed, failures)
@@ -0,0 +1,112 @@
+"""
+Structural checks on submitted JSON text, run before ``json.loads``.
+
+``json.loads`` builds the whole document before anything can be rejected and
+recurses on nesting, so a huge or deeply nested paste can exhaust worker
+memory or the stack. ``check_limits`` walks the text token by token without
+building any objects and stops at the first exceeded limit.
+"""
+import base64
+import binascii
+import re
+import zlib
+
+# Strings (optionally followed by a colon, which makes them object keys),
+# brackets, and runs of anything else (numbers, literals, invalid input).
+# The closing quote is optional so an unterminated string runs to the end of
+# the input in one match instead of being retried from every later quote,
+# which would take quadratic time; ``json.loads`` then reports the error.
+TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"?(\s*:)?|[\[{]|[\]}]|[^\s,:\[\]{}"]+', re.DOTALL)
+
+
+# Characters encoded at a time when measuring the UTF-8 size of a text.
+UTF8_CHUNK_SIZE = 64 * 1024
+
+# ``wbits`` for the formats produced by the browser ``CompressionStream``.
+COMPRESSION_WBITS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+class LimitExceeded(ValueError):
+    def __init__(self, code, limit, value=None):
+        super().__init__(code)
+        self.code = code
+        self.limit = limit
+        self.value = value
+
+
+def utf8_length(value, limit):
+    """
+    Return the UTF-8 size of ``value``, or its length in characters when that
+    is enough to tell it is within ``limit``, without an encoded copy of the
+    whole text.
+    """
+    # A character takes between one and four bytes.
+    if value.isascii() or len(value) * 4 <= limit:
+        return len(value)
+    return sum(
+        len(value[start:start + UTF8_CHUNK_SIZE].encode('utf-8'))
+        for start in range(0, len(value), UTF8_CHUNK_SIZE)
+    )
+
+
+def check_limits(value, max_bytes=None, max_depth=None, max_nodes=None):
+    """
+    Raise ``LimitExceeded`` if the JSON text ``value`` is larger than
+    ``max_bytes``, nests deeper than ``max_depth`` or holds more than
+    ``max_nodes`` values. Malformed input is left for ``json.loads`` to report.
+    """
+    if max_bytes is not None:
+        size = utf8_length(value, max_bytes)
+        if size > max_bytes:
+            raise LimitExceeded('max_bytes', max_bytes, size)
+
+    if max_depth is None and max_nodes is None:
+        return
+
+    depth = nodes = 0
+    for match in TOKEN_RE.finditer(value):
+        # Look at the first character only, so long strings are never copied.
+        token = value[match.start()]
+        if token in ('[', '{'):
+            depth += 1
+            nodes += 1
+            if max_depth is not None and depth > max_depth:
+                raise LimitExceeded('max_depth', max_depth)
+        elif token in (']', '}'):
+            depth -= 1
+            continue
+        elif match.group(1) is None:
+            nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise LimitExceeded('max_nodes', max_nodes)
+
+
+def decompress(value, encoding, max_size):
+    """
+    Decode a base64 encoded, compressed document submitted by the widget.
+
+    Output is inflated at most ``max_size`` bytes at a time, so a
+    decompression bomb is rejected without being expanded. Raises
+    ``LimitExceeded`` when the cap is hit and ``ValueError`` for anything
+    malformed.
+    """
+    if encoding not in COMPRESSION_WBITS:
+        raise ValueError(f'Unsupported encoding: {encoding!r}')
+    try:
+        data = base64.b64decode(value, validate=True)
+    except binascii.Error as e:
+        raise ValueError(str(e)) from e
+
+    decompressor = zlib.decompressobj(COMPRESSION_WBITS[encoding])
+    try:
+        result = decompressor.decompress(data, max_size)
+    except zlib.error as e:
+        raise ValueError(str(e)) from e
+    if decompressor.unconsumed_tail:
+        raise LimitExceeded('max_decompressed_size', max_size)
+    if not decompressor.eof:
+        raise ValueError('Truncated compressed data')
+    return result.decode('utf-8')
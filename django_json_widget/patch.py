@@ -0,0 +1,163 @@
+"""
+JSON Patch (RFC 6902) and JSON Merge Patch (RFC 7396).
+"""
+import copy
+
+_MISSING = object()
+
+
+class PatchError(ValueError):
+    pass
+
+
+def parse_pointer(pointer):
+    """Split a JSON Pointer (RFC 6901) into its unescaped reference tokens."""
+    if not isinstance(pointer, str):
+        raise PatchError('A JSON Pointer must be a string.')
+    if pointer == '':
+        return []
+    if not pointer.startswith('/'):
+        raise PatchError(f'Invalid JSON Pointer {pointer!r}.')
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _index(container, token, allow_end=False):
+    if token == '-' and allow_end:
+        return len(container)
+    if not token.isdigit() or (token != '0' and token.startswith('0')):
+        raise PatchError(f'Invalid array index {token!r}.')
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(f'Array index {index} out of range.')
+    return index
+
+
+def _resolve(document, tokens):
+    for token in tokens:
+        if isinstance(document, dict):
+            if token not in document:
+                raise PatchError(f'Path member {token!r} does not exist.')
+            document = document[token]
+        elif isinstance(document, list):
+            document = document[_index(document, token)]
+        else:
+            raise PatchError(f'Cannot traverse into a scalar at {token!r}.')
+    return document
+
+
+def json_equal(a, b):
+    """
+    Compare two values the way JSON does: ``1`` equals ``1.0`` but ``True``
+    is not a number, and object member order is irrelevant.
+    """
+    if isinstance(a, bool) or isinstance(b, bool):
+        return a is b
+    if isinstance(a, (int, float)) and isinstance(b, (int, float)):
+        return a == b
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(json_equal(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return isinstance(b, list) and len(a) == len(b) and all(map(json_equal, a, b))
+    return type(a) is type(b) and a == b
+
+
+def _get(document, pointer):
+    return _resolve(document, parse_pointer(pointer))
+
+
+def _add(document, tokens, value):
+    if not tokens:
+        return value
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    else:
+        raise PatchError('Cannot add a member to a scalar.')
+    return document
+
+
+def _remove(document, tokens):
+    if not tokens:
+        raise PatchError('Cannot remove the whole document.')
+    parent = _resolve(document, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise PatchError(f'Path member {tokens[-1]!r} does not exist.')
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    raise PatchError('Cannot remove a member of a scalar.')
+
+
+def validate_json_patch(operations):
+    """Check the structure of a JSON Patch document, raising ``PatchError``."""
+    if not isinstance(operations, list):
+        raise PatchError('A JSON Patch must be a list of operations.')
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError('Each JSON Patch operation must be an object.')
+        op = operation.get('op')
+        if op not in ('add', 'remove', 'replace', 'move', 'copy', 'test'):
+            raise PatchError(f'Unknown JSON Patch operation {op!r}.')
+        parse_pointer(operation.get('path'))
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'The {op!r} operation requires a value.')
+        if op in ('move', 'copy'):
+            parse_pointer(operation.get('from'))
+
+
+def apply_json_patch(document, operations):
+    """
+    Return ``document`` with the JSON Patch ``operations`` applied. The
+    document passed in is left untouched, so a failing operation halfway
+    through never leaves a partially patched value behind.
+    """
+    validate_json_patch(operations)
+    document = copy.deepcopy(document)
+    for operation in operations:
+        op, tokens = operation['op'], parse_pointer(operation['path'])
+        if op == 'add':
+            document = _add(document, tokens, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            _remove(document, tokens)
+        elif op == 'replace':
+            value = copy.deepcopy(operation['value'])
+            if not tokens:
+                document = value
+                continue
+            parent = _resolve(document, tokens[:-1])
+            if isinstance(parent, dict) and tokens[-1] in parent:
+                parent[tokens[-1]] = value
+            elif isinstance(parent, list):
+                parent[_index(parent, tokens[-1])] = value
+            else:
+                raise PatchError('Path {!r} does not exist.'.format(operation['path']))
+        elif op == 'move':
+            source = parse_pointer(operation['from'])
+            if tokens[:len(source)] == source and tokens != source:
+                raise PatchError('Cannot move a value into one of its children.')
+            value = _remove(document, source) if source else document
+            document = _add(document, tokens, value)
+        elif op == 'copy':
+            value = copy.deepcopy(_get(document, operation['from']))
+            document = _add(document, tokens, value)
+        elif op == 'test':
+            actual = _resolve(document, tokens)
+            if not json_equal(actual, operation['value']):
+                raise PatchError('Test failed at {!r}.'.format(operation['path']))
+    return document
+
+
+def apply_merge_patch(document, patch):
+    """Return ``document`` with the JSON Merge Patch ``patch`` applied."""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+    result = dict(document) if isinstance(document, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key, _MISSING), value)
+    return result
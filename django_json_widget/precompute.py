@@ -0,0 +1,252 @@
+"""
+Per-document artefacts (size summary, top-level keys, digest and preview)
+computed ahead of time by the ``precompute_json`` management command.
+
+Artefacts are kept in the store named by the ``JSON_EDITOR_PRECOMPUTE_STORE``
+setting: ``'cache'`` for the Django cache or ``'table'`` for the
+``PrecomputedJSON`` model. Entries are keyed by model, field and primary key
+and carry the digest of the document they were computed from, which lets a
+later run skip unchanged rows. Saving or deleting an object drops its entries
+(see ``apps.py``); readers fall back to computing values live when an entry
+is missing. ``JSON_EDITOR_PRECOMPUTE_MODELS`` optionally lists the models
+precomputed, so saves of other models never touch the store.
+"""
+import json
+import logging
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from .widgets import value_digest
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+# Characters of the serialized document kept as a preview, and top-level
+# keys kept per document.
+PREVIEW_LENGTH = 200
+MAX_KEYS = 100
+
+PrecomputeResult = namedtuple('PrecomputeResult', 'processed computed skipped')
+
+
+def compute_artefacts(value):
+    """Return the artefacts of one document (a decoded JSON value)."""
+    text = json.dumps(value, ensure_ascii=False)
+    nodes = depth = 0
+    stack = [(value, 1)]
+    while stack:
+        item, level = stack.pop()
+        nodes += 1
+        if isinstance(item, dict):
+            depth = max(depth, level)
+            stack.extend((child, level + 1) for child in item.values())
+        elif isinstance(item, list):
+            depth = max(depth, level)
+            stack.extend((child, level + 1) for child in item)
+    return {
+        'digest': value_digest(text),
+        'size': len(text.encode('utf-8')),
+        'nodes': nodes,
+        'depth': depth,
+        'keys': list(value)[:MAX_KEYS] if isinstance(value, dict) else None,
+        # One character more than kept, so truncation can be detected.
+        'preview': text[:PREVIEW_LENGTH + 1],
+    }
+
+
+def _compute_chunk(rows):
+    """
+    Compute artefacts for ``(pk, field_name, value, known_digest)`` rows,
+    leaving out rows whose digest did not change. Runs in worker processes.
+    """
+    results = []
+    for pk, field_name, value, known_digest in rows:
+        if known_digest is not None and value_digest(json.dumps(value, ensure_ascii=False)) == known_digest:
+            continue
+        results.append((pk, field_name, compute_artefacts(value)))
+    return results
+
+
+class CacheStore:
+    timeout = None
+
+    @property
+    def per_process(self):
+        """Whether entries only live in the process that stores them."""
+        return isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+    def _key(self, model, field_name, pk):
+        return f'django_json_widget:precomputed:{model._meta.label_lower}.{field_name}:{pk}'
+
+    def get_many(self, model, field_name, pks):
+        keys = {self._key(model, field_name, pk): pk for pk in pks}
+        return {keys[key]: artefacts for key, artefacts in cache.get_many(list(keys)).items()}
+
+    def set_many(self, model, field_name, entries):
+        cache.set_many(
+            {self._key(model, field_name, pk): artefacts for pk, artefacts in entries.items()},
+            getattr(settings, 'JSON_EDITOR_PRECOMPUTE_TIMEOUT', self.timeout),
+        )
+
+    def delete_many(self, model, field_name, pks):
+        cache.delete_many([self._key(model, field_name, pk) for pk in pks])
+
+
+class TableStore:
+    per_process = False
+
+    def _rows(self, model, field_name, pks):
+        from .models import PrecomputedJSON
+
+        return PrecomputedJSON.objects.filter(
+            model=model._meta.label_lower, field=field_name, object_pk__in=[str(pk) for pk in pks],
+        )
+
+    def get_many(self, model, field_name, pks):
+        by_str = {str(pk): pk for pk in pks}
+        rows = self._rows(model, field_name, pks).values_list('object_pk', 'artefacts')
+        return {by_str[object_pk]: artefacts for object_pk, artefacts in rows}
+
+    def set_many(self, model, field_name, entries):
+        from .models import PrecomputedJSON
+
+        with transaction.atomic(using=PrecomputedJSON.objects.db):
+            self._rows(model, field_name, entries).delete()
+            PrecomputedJSON.objects.bulk_create([
+                PrecomputedJSON(
+                    model=model._meta.label_lower,
+                    field=field_name,
+                    object_pk=str(pk),
+                    digest=artefacts['digest'],
+                    artefacts=artefacts,
+                )
+                for pk, artefacts in entries.items()
+            ])
+
+    def delete_many(self, model, field_name, pks):
+        self._rows(model, field_name, pks).delete()
+
+
+STORES = {
+    'cache': CacheStore,
+    'table': TableStore,
+}
+
+
+def get_store():
+    """Return the configured store, or ``None`` when precomputing is off."""
+    name = getattr(settings, 'JSON_EDITOR_PRECOMPUTE_STORE', None)
+    return STORES[name]() if name else None
+
+
+def is_precomputed(model):
+    """
+    Whether ``model`` may have stored artefacts: a store is configured and
+    ``JSON_EDITOR_PRECOMPUTE_MODELS``, when set, lists it.
+    """
+    if not getattr(settings, 'JSON_EDITOR_PRECOMPUTE_STORE', None):
+        return False
+    labels = getattr(settings, 'JSON_EDITOR_PRECOMPUTE_MODELS', None)
+    return labels is None or model._meta.label_lower in {label.lower() for label in labels}
+
+
+def get_precomputed(model, field_name, pks):
+    """Return ``{pk: artefacts}`` for the rows of ``pks`` that have entries."""
+    if not is_precomputed(model) or not pks:
+        return {}
+    return get_store().get_many(model, field_name, pks)
+
+
+def invalidate(model, field_names, pks):
+    """Drop the entries of ``pks``, e.g. after a bulk update bypassing signals."""
+    if not is_precomputed(model) or not pks:
+        return
+    store = get_store()
+    for field_name in field_names:
+        store.delete_many(model, field_name, pks)
+
+
+def precompute(queryset, field_names, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, resume=False, progress=None):
+    """
+    Compute and store the artefacts of ``field_names`` for every row of
+    ``queryset``.
+
+    Rows are read ``chunk_size`` at a time with ``.iterator()`` and each chunk
+    is handed to a ``ProcessPoolExecutor`` of ``workers`` processes (computed
+    inline with ``workers=0``), with at most two chunks per worker in flight.
+    Rows whose stored digest matches are skipped; with ``resume``, rows that
+    have an entry at all are skipped without being hashed, to pick up an
+    interrupted run. ``progress``, if given, is called with the running
+    ``PrecomputeResult`` after each chunk.
+    """
+    store = get_store()
+    if store is None:
+        raise ValueError('Set JSON_EDITOR_PRECOMPUTE_STORE to "cache" or "table".')
+    model = queryset.model
+    if not is_precomputed(model):
+        raise ValueError(f'Add {model._meta.label} to JSON_EDITOR_PRECOMPUTE_MODELS.')
+    pk_name = model._meta.pk.name
+    rows = queryset.order_by(pk_name).values_list(pk_name, *field_names).iterator(chunk_size=chunk_size)
+
+    processed = computed = skipped = 0
+
+    def chunks():
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                yield prepare(batch)
+                batch = []
+        if batch:
+            yield prepare(batch)
+
+    def prepare(batch):
+        nonlocal processed, skipped
+        processed += len(batch)
+        pks = [row[0] for row in batch]
+        tasks = []
+        for index, field_name in enumerate(field_names, 1):
+            known = store.get_many(model, field_name, pks)
+            for row in batch:
+                digest = known.get(row[0], {}).get('digest')
+                if resume and digest is not None:
+                    skipped += 1
+                else:
+                    tasks.append((row[0], field_name, row[index], digest))
+        return tasks
+
+    def save(tasks, results):
+        nonlocal computed, skipped
+        by_field = {}
+        for pk, field_name, artefacts in results:
+            by_field.setdefault(field_name, {})[pk] = artefacts
+        for field_name, entries in by_field.items():
+            store.set_many(model, field_name, entries)
+        computed += len(results)
+        skipped += len(tasks) - len(results)
+        result = PrecomputeResult(processed, computed, skipped)
+        logger.info('Precompute of %s: %s', model._meta.label, result)
+        if progress:
+            progress(result)
+
+    if not workers:
+        for tasks in chunks():
+            save(tasks, _compute_chunk(tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            in_flight = []
+            for tasks in chunks():
+                in_flight.append((tasks, executor.submit(_compute_chunk, tasks)))
+                if len(in_flight) >= workers * 2:
+                    tasks, future = in_flight.pop(0)
+                    save(tasks, future.result())
+            for tasks, future in in_flight:
+                save(tasks, future.result())
+
+    return PrecomputeResult(processed, computed, skipped)
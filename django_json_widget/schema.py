@@ -0,0 +1,189 @@
+"""
+JSON Schema inference from the documents already stored in a model field.
+
+Each document is reduced to a type summary (the JSON types seen at every
+path, the keys of objects and how often they occur, and the items of
+arrays), and summaries are merged into one running summary, so memory
+depends on the variety of the documents rather than their number. Objects
+track at most ``MAX_PROPERTIES`` keys and nesting is followed
+``MAX_DEPTH`` levels deep.
+
+Inferred schemas are registered in the ``InferredSchema`` model, where
+``JSONEditorField`` finds them for model forms and ``JSONEditorWidget``
+passes them to the editor for client-side validation. Lookups are cached
+in the Django cache for ``JSON_EDITOR_SCHEMA_TIMEOUT`` seconds, so a
+per-process cache only delays a new registration in other processes.
+"""
+import json
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import TextField
+from django.db.models.functions import Cast
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_TIMEOUT = 300
+MAX_DEPTH = 20
+MAX_PROPERTIES = 200
+SCHEMA_DRAFT = 'http://json-schema.org/draft-07/schema#'
+
+InferenceReport = namedtuple('InferenceReport', 'rows characters seconds')
+
+
+def _type(value):
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'boolean'
+    if isinstance(value, int):
+        return 'integer'
+    if isinstance(value, float):
+        return 'number'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, list):
+        return 'array'
+    return 'object'
+
+
+def summarize(value, depth=0):
+    """Return the type summary of one JSON value."""
+    kind = _type(value)
+    summary = {'types': {kind: 1}}
+    if depth >= MAX_DEPTH:
+        return summary
+    if kind == 'object':
+        keys = list(value)[:MAX_PROPERTIES]
+        summary['properties'] = {key: summarize(value[key], depth + 1) for key in keys}
+        summary['present'] = dict.fromkeys(keys, 1)
+        summary['truncated'] = len(value) > MAX_PROPERTIES
+    elif kind == 'array' and value:
+        items = summarize(value[0], depth + 1)
+        for item in value[1:]:
+            items = merge(items, summarize(item, depth + 1))
+        summary['items'] = items
+    return summary
+
+
+def merge(summary, other):
+    """Merge the type summary ``other`` into ``summary`` and return it."""
+    for kind, count in other['types'].items():
+        summary['types'][kind] = summary['types'].get(kind, 0) + count
+
+    if 'properties' in other:
+        properties = summary.setdefault('properties', {})
+        present = summary.setdefault('present', {})
+        summary['truncated'] = summary.get('truncated', False) or other['truncated']
+        for key, child in other['properties'].items():
+            if key in properties:
+                merge(properties[key], child)
+                present[key] += other['present'][key]
+            elif len(properties) < MAX_PROPERTIES:
+                properties[key] = child
+                present[key] = other['present'][key]
+            else:
+                summary['truncated'] = True
+
+    if 'items' in other:
+        if 'items' in summary:
+            merge(summary['items'], other['items'])
+        else:
+            summary['items'] = other['items']
+    return summary
+
+
+def to_json_schema(summary, root=True):
+    """Turn a type summary into a JSON Schema."""
+    types = sorted(summary['types'])
+    if 'integer' in types and 'number' in types:
+        types.remove('integer')
+    schema = {'$schema': SCHEMA_DRAFT} if root else {}
+    schema['type'] = types[0] if len(types) == 1 else types
+
+    if 'properties' in summary:
+        objects = summary['types']['object']
+        schema['properties'] = {
+            key: to_json_schema(child, root=False) for key, child in summary['properties'].items()
+        }
+        required = [key for key, count in summary['present'].items() if count == objects]
+        if required:
+            schema['required'] = required
+    if 'items' in summary:
+        schema['items'] = to_json_schema(summary['items'], root=False)
+    return schema
+
+
+def infer_schema(queryset, field_name, sample=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Infer a JSON Schema for ``field_name`` from the rows of ``queryset``, or
+    from a random sample of ``sample`` rows, read with ``.iterator()``.
+
+    Returns the schema and an ``InferenceReport`` of the rows and characters
+    of JSON text scanned and the time taken.
+    """
+    started = time.monotonic()
+    queryset = queryset.annotate(_json_text=Cast(field_name, TextField()))
+    if sample:
+        queryset = queryset.order_by('?')[:sample]
+    rows = queryset.values_list('_json_text', flat=True).iterator(chunk_size=chunk_size)
+
+    summary = None
+    count = characters = 0
+    for text in rows:
+        if text is None:
+            continue
+        count += 1
+        characters += len(text)
+        document = summarize(json.loads(text))
+        summary = document if summary is None else merge(summary, document)
+
+    schema = to_json_schema(summary) if summary else {'$schema': SCHEMA_DRAFT}
+    return schema, InferenceReport(count, characters, time.monotonic() - started)
+
+
+def _cache_key(model, field_name):
+    return f'django_json_widget:schema:{model._meta.label_lower}.{field_name}'
+
+
+def _entry(model, field_name):
+    key = _cache_key(model, field_name)
+    entry = cache.get(key)
+    if entry is None:
+        from .models import InferredSchema
+
+        row = InferredSchema.objects.filter(model=model._meta.label_lower, field=field_name).first()
+        # An empty entry caches the absence of a schema too.
+        entry = {'schema': row.schema, 'report': row.report} if row else {}
+        cache.set(key, entry, getattr(settings, 'JSON_EDITOR_SCHEMA_TIMEOUT', DEFAULT_TIMEOUT))
+    return entry
+
+
+def register_schema(model, field_name, schema, report=None):
+    """Register ``schema`` for ``field_name``, replacing any inferred one."""
+    from .models import InferredSchema
+
+    InferredSchema.objects.update_or_create(
+        model=model._meta.label_lower, field=field_name,
+        defaults={'schema': schema, 'report': list(report) if report else None},
+    )
+    cache.delete(_cache_key(model, field_name))
+
+
+def unregister_schema(model, field_name):
+    from .models import InferredSchema
+
+    InferredSchema.objects.filter(model=model._meta.label_lower, field=field_name).delete()
+    cache.delete(_cache_key(model, field_name))
+
+
+def get_schema(model, field_name):
+    """Return the schema registered for ``field_name``, or ``None``."""
+    return _entry(model, field_name).get('schema')
+
+
+def get_report(model, field_name):
+    """Return the ``InferenceReport`` of the registered schema, if inferred."""
+    report = _entry(model, field_name).get('report')
+    return InferenceReport(*report) if report else None
@@ -0,0 +1,86 @@
+/*
+ * Shared modal editor for JSONEditorModalWidget.
+ *
+ * A single JSONEditor instance is created lazily for the whole page. Clicks
+ * on cell previews are delegated from the document, and each preview finds
+ * the input in its own cell rather than by id, so rows added later (e.g.
+ * "Add another" in inlines, whose ids are renumbered) need no setup.
+ */
+(function () {
+    var modal = null;
+    var editor = null;
+    var current = null;
+
+    function truncate(text, length) {
+        return text.length <= length ? text : text.slice(0, length - 1) + "…";
+    }
+
+    function build(options) {
+        modal = document.createElement("div");
+        modal.className = "django-json-widget-modal";
+        modal.innerHTML =
+            '<div class="django-json-widget-modal-dialog" role="dialog" aria-modal="true">' +
+            '<div class="django-json-widget-modal-editor"></div>' +
+            '<div class="django-json-widget-modal-actions">' +
+            '<button type="button" class="button default" data-action="save">OK</button> ' +
+            '<button type="button" class="button" data-action="cancel">Cancel</button>' +
+            '</div></div>';
+        document.body.appendChild(modal);
+
+        editor = new JSONEditor(modal.querySelector(".django-json-widget-modal-editor"), options);
+        window.djangoJsonWidgetModalEditor = editor;
+
+        modal.addEventListener("click", function (event) {
+            var action = event.target.getAttribute("data-action");
+            if (action === "save") {
+                close(true);
+            } else if (action === "cancel" || event.target === modal) {
+                close(false);
+            }
+        });
+        document.addEventListener("keydown", function (event) {
+            if (event.key === "Escape" && current) close(false);
+        });
+    }
+
+    function open(button) {
+        var input = button.closest(".django-json-widget-cell").querySelector("input[type=hidden]");
+        var options = JSON.parse(input.getAttribute("data-options"));
+        if (!editor) build(options);
+
+        current = {button: button, input: input};
+        if (options.mode && editor.setMode && editor.getMode() !== options.mode) {
+            editor.setMode(options.mode);
+        }
+        editor.set(JSON.parse(input.value));
+        modal.classList.add("open");
+    }
+
+    function close(save) {
+        if (save) {
+            var text;
+            try {
+                text = JSON.stringify(editor.get());
+            } catch (e) {
+                // Leave the modal open on invalid JSON in text/code mode.
+                return;
+            }
+            current.input.value = text;
+            current.button.textContent = truncate(text, parseInt(current.button.getAttribute("data-preview-length"), 10));
+            current.button.title = truncate(text, 500);
+            current.input.dispatchEvent(new Event("change", {bubbles: true}));
+        }
+        modal.classList.remove("open");
+        // Drop the document so the editor does not hold on to it.
+        editor.set(null);
+        current = null;
+    }
+
+    document.addEventListener("click", function (event) {
+        var button = event.target.closest && event.target.closest(".django-json-widget-preview");
+        if (button) {
+            event.preventDefault();
+            open(button);
+        }
+    });
+})();
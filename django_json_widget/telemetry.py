@@ -0,0 +1,143 @@
+"""
+Aggregation of the client-side timings reported by the widget script.
+
+Samples are folded into fixed histograms stored in the Django cache so the
+aggregate stays a constant size no matter how many beacons are received.
+"""
+from django.core.cache import cache
+
+CACHE_KEY = 'django_json_widget:telemetry'
+
+PHASES = ('bundle', 'parse', 'construct', 'set')
+
+# Upper bounds (in milliseconds) of the duration histogram buckets; the last
+# bucket catches everything slower.
+DURATION_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+# Upper bounds (in bytes) of the document size buckets, with their labels.
+SIZE_BUCKETS = (
+    (10 * 1024, '<10KB'),
+    (100 * 1024, '<100KB'),
+    (1024 * 1024, '<1MB'),
+    (10 * 1024 * 1024, '<10MB'),
+)
+LARGEST_SIZE_LABEL = '>=10MB'
+
+MAX_DURATION = 60 * 1000
+MAX_SAMPLES = 100
+
+
+def size_label(size):
+    for limit, label in SIZE_BUCKETS:
+        if size < limit:
+            return label
+    return LARGEST_SIZE_LABEL
+
+
+def _duration_index(duration):
+    for index, limit in enumerate(DURATION_BUCKETS):
+        if duration <= limit:
+            return index
+    return len(DURATION_BUCKETS)
+
+
+def _empty_stats():
+    return {'count': 0, 'total': 0.0, 'histogram': [0] * (len(DURATION_BUCKETS) + 1)}
+
+
+def _add(stats, duration):
+    stats['count'] += 1
+    stats['total'] += duration
+    stats['histogram'][_duration_index(duration)] += 1
+
+
+def percentile(stats, fraction):
+    """
+    Return the upper bound of the histogram bucket holding the given
+    percentile, or ``None`` when the slowest bucket is reached.
+    """
+    if not stats['count']:
+        return None
+    rank = stats['count'] * fraction
+    seen = 0
+    for index, count in enumerate(stats['histogram']):
+        seen += count
+        if seen >= rank and count:
+            return DURATION_BUCKETS[index] if index < len(DURATION_BUCKETS) else None
+    return None
+
+
+def clean_samples(samples):
+    """
+    Validate the samples posted by the browser, silently dropping anything
+    malformed. Returns a list of ``(phase, duration, size)`` tuples.
+    """
+    if not isinstance(samples, list):
+        return []
+
+    cleaned = []
+    for sample in samples[:MAX_SAMPLES]:
+        if not isinstance(sample, dict) or sample.get('phase') not in PHASES:
+            continue
+        duration, size = sample.get('duration'), sample.get('size', 0)
+        if isinstance(duration, bool) or not isinstance(duration, (int, float)):
+            continue
+        if isinstance(size, bool) or not isinstance(size, int):
+            continue
+        if not 0 <= duration <= MAX_DURATION or size < 0:
+            continue
+        cleaned.append((sample['phase'], float(duration), size))
+    return cleaned
+
+
+def record(samples):
+    """
+    Fold cleaned samples into the cached aggregate.
+
+    The read-modify-write is not atomic; concurrent beacons may occasionally
+    drop a sample, which is acceptable for sampling telemetry.
+    """
+    if not samples:
+        return
+    data = get_aggregates()
+    for phase, duration, size in samples:
+        _add(data['phases'].setdefault(phase, _empty_stats()), duration)
+        by_size = data['sizes'].setdefault(size_label(size), {})
+        _add(by_size.setdefault(phase, _empty_stats()), duration)
+    cache.set(CACHE_KEY, data, None)
+
+
+def get_aggregates():
+    return cache.get(CACHE_KEY) or {'phases': {}, 'sizes': {}}
+
+
+def reset():
+    cache.delete(CACHE_KEY)
+
+
+def summarize(stats):
+    return {
+        'count': stats['count'],
+        'mean': stats['total'] / stats['count'] if stats['count'] else None,
+        'p50': percentile(stats, 0.5),
+        'p95': percentile(stats, 0.95),
+    }
+
+
+def report():
+    """
+    Return the aggregates as rows ready for display, ordered by phase and
+    document size bucket.
+    """
+    data = get_aggregates()
+    labels = [label for _limit, label in SIZE_BUCKETS] + [LARGEST_SIZE_LABEL]
+    phases = [
+        dict(phase=phase, **summarize(data['phases'][phase]))
+        for phase in PHASES if phase in data['phases']
+    ]
+    sizes = [
+        dict(size=label, phase=phase, **summarize(data['sizes'][label][phase]))
+        for label in labels if label in data['sizes']
+        for phase in PHASES if phase in data['sizes'][label]
+    ]
+    return {'phases': phases, 'sizes': sizes}
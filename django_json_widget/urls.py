@@ -1 +1,12 @@
 # -*- coding: utf-8 -*-
+from django.urls import path
+
+from . import views
+
+app_name = 'django_json_widget'
+
+urlpatterns = [
+    path('telemetry/', views.telemetry_beacon, name='telemetry'),
+    path('telemetry/report/', views.telemetry_report, name='telemetry_report'),
+    path('autocomplete/<str:label>/', views.autocomplete, name='autocomplete'),
+]
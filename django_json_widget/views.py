@@ -0,0 +1,74 @@
+import json
+
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.shortcuts import render
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+
+from . import autocomplete as autocomplete_index
+from . import telemetry
+
+TELEMETRY_MAX_BODY = 64 * 1024
+
+
+@csrf_exempt
+@require_POST
+def telemetry_beacon(request):
+    """
+    Receive a batch of timings sent with ``navigator.sendBeacon``.
+
+    Beacons cannot carry a CSRF token; the view only accepts bounded numeric
+    samples and never touches user data, so it is exempt. Beacons do carry
+    cookies, and samples from anonymous clients are ignored so they cannot
+    skew the shared aggregate.
+    """
+    if not request.user.is_authenticated:
+        return HttpResponse(status=204)
+    if len(request.body) > TELEMETRY_MAX_BODY:
+        return HttpResponseBadRequest()
+    try:
+        payload = json.loads(request.body)
+    except ValueError:
+        return HttpResponseBadRequest()
+    if not isinstance(payload, dict):
+        return HttpResponseBadRequest()
+
+    telemetry.record(telemetry.clean_samples(payload.get('samples')))
+    return HttpResponse(status=204)
+
+
+@staff_member_required
+def telemetry_report(request):
+    context = {
+        'title': 'JSON editor timings',
+        'report': telemetry.report(),
+    }
+    return render(request, 'django_json_widget/telemetry_report.html', context)
+
+
+@staff_member_required
+def autocomplete(request, label):
+    """
+    Suggest keys or values for a model's JSON field, e.g.
+    ``?kind=key&path=["stats","hp"]&prefix=h``. Requires the view permission
+    on the model.
+    """
+    try:
+        model, field_name = autocomplete_index.get_field_model(label)
+    except LookupError:
+        raise Http404(f'No JSON field {label}') from None
+    if not request.user.has_perm(f'{model._meta.app_label}.view_{model._meta.model_name}'):
+        raise PermissionDenied
+
+    kind = request.GET.get('kind', 'key')
+    try:
+        path = json.loads(request.GET.get('path', '[]'))
+    except ValueError:
+        return HttpResponseBadRequest()
+    if kind not in ('key', 'value') or not isinstance(path, list):
+        return HttpResponseBadRequest()
+
+    results = autocomplete_index.suggest(model, field_name, kind, path, request.GET.get('prefix', ''))
+    return JsonResponse({'results': results})
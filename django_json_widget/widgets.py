@@ -1,7 +1,68 @@
+import hashlib
 import json
 
 from django import forms
 from django.conf import settings
+from django.core import signing
+from django.forms.fields import InvalidJSONInput
+from django.urls import reverse
+
+from .parsing import LimitExceeded, decompress
+
+UNCHANGED_SUFFIX = '__unchanged'
+UNCHANGED_SALT = 'django_json_widget.unchanged'
+COMPRESSED_SUFFIX = '__compressed'
+
+
+def value_digest(value):
+    """
+    Return a digest of a value as handed to the widget for rendering, either
+    a JSON string (as prepared by ``forms.JSONField``) or a Python structure.
+    """
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+class UnchangedValue:
+    """
+    Submitted in place of the document when the editor was never touched.
+    Carries the signed digest of the value the widget was rendered with.
+    """
+
+    def __init__(self, token):
+        self.token = token
+
+    def matches(self, value):
+        try:
+            digest = signing.Signer(salt=UNCHANGED_SALT).unsign(self.token)
+        except signing.BadSignature:
+            return False
+        return digest == value_digest(value)
+
+
+class InvalidCompressedInput(str):
+    """
+    Returned instead of the document when a compressed submission cannot be
+    decoded. Never valid JSON, so any ``JSONField`` rejects it.
+    """
+
+    def __new__(cls, value, code):
+        self = super().__new__(cls, value)
+        self.code = code
+        return self
+
+
+class PrecomputedValue(str):
+    """
+    A JSON string handed to the widget along with the artefacts precomputed
+    for the stored document (see ``django_json_widget.precompute``).
+    """
+
+    def __new__(cls, value, artefacts):
+        self = super().__new__(cls, value)
+        self.artefacts = artefacts
+        return self
 
 
 class JSONEditorWidget(forms.Widget):
@@ -17,7 +78,12 @@ class JSONEditorWidget(forms.Widget):
 
     template_name = 'django_json_widget.html'
 
-    def __init__(self, attrs=None, mode='code', options=None, width=None, height=None):
+    # Enabled by form fields that know how to resolve an ``UnchangedValue``
+    # back to the stored value (see ``django_json_widget.forms``).
+    unchanged_marker = False
+
+    def __init__(self, attrs=None, mode='code', options=None, width=None, height=None,
+                 compress_threshold=None, max_decompressed_size=None, autocomplete=None, schema=None):
         default_options = {
             'modes': ['text', 'code', 'tree', 'form', 'view'],
             'mode': mode,
@@ -29,19 +95,116 @@ class JSONEditorWidget(forms.Widget):
         self.options = default_options
         self.width = width
         self.height = height
+        self.compress_threshold = compress_threshold
+        if max_decompressed_size is None:
+            max_decompressed_size = getattr(settings, "JSON_EDITOR_MAX_DECOMPRESSED_SIZE", 20 * 1024 * 1024)
+        self.max_decompressed_size = max_decompressed_size
+        self.autocomplete = autocomplete
+        self.schema = schema
 
         super().__init__(attrs=attrs)
 
     def get_context(self, name, value, attrs):
         context = super().get_context(name, value, attrs)
-        context['widget']['options'] = json.dumps(self.options)
+        schema = self.get_schema()
+        context['widget']['options'] = json.dumps(dict(self.options, schema=schema) if schema else self.options)
         context['widget']['width'] = self.width
         context['widget']['height'] = self.height
+        if getattr(settings, "JSON_EDITOR_TELEMETRY", False):
+            context['widget']['telemetry_url'] = reverse('django_json_widget:telemetry')
+        if self.unchanged_marker and value is not None:
+            context['widget']['unchanged_name'] = name + UNCHANGED_SUFFIX
+            context['widget']['unchanged_token'] = signing.Signer(salt=UNCHANGED_SALT).sign(value_digest(value))
+        if isinstance(value, PrecomputedValue):
+            context['widget']['summary'] = value.artefacts
+        if self.autocomplete:
+            context['widget']['autocomplete_url'] = reverse(
+                'django_json_widget:autocomplete', args=[self.autocomplete],
+            )
+        if self.compress_threshold is not None:
+            context['widget']['compress_threshold'] = int(self.compress_threshold)
+            context['widget']['compressed_name'] = name + COMPRESSED_SUFFIX
 
         return context
 
+    def get_schema(self):
+        """
+        Return the JSON Schema the editor validates against: ``schema`` itself,
+        or the schema registered for the ``'app_label.model_name.field_name'``
+        it names (see ``django_json_widget.schema``).
+        """
+        if not isinstance(self.schema, str):
+            return self.schema
+        from .autocomplete import get_field_model
+        from .schema import get_schema
+
+        return get_schema(*get_field_model(self.schema))
+
     def format_value(self, value):
-        if not isinstance(value, (dict, list)):
-            return json.loads(value)
-        else:
+        if isinstance(value, (dict, list)):
             return value
+        if isinstance(value, (InvalidCompressedInput, InvalidJSONInput)):
+            # Invalid input re-rendered after a failed submission; an
+            # undecodable compressed one has nothing worth redisplaying.
+            return None
+        return json.loads(value)
+
+    def value_from_datadict(self, data, files, name):
+        marker = name + UNCHANGED_SUFFIX
+        if self.unchanged_marker and name not in data and marker in data:
+            return UnchangedValue(data[marker])
+
+        value = super().value_from_datadict(data, files, name)
+        encoding = data.get(name + COMPRESSED_SUFFIX)
+        if self.compress_threshold is None or not encoding or value is None:
+            return value
+        try:
+            return decompress(value, encoding, self.max_decompressed_size)
+        except LimitExceeded:
+            return InvalidCompressedInput(value, 'max_decompressed_size')
+        except ValueError:
+            return InvalidCompressedInput(value, 'invalid_compressed')
+
+    def value_omitted_from_data(self, data, files, name):
+        return (
+            super().value_omitted_from_data(data, files, name)
+            and not (self.unchanged_marker and name + UNCHANGED_SUFFIX in data)
+        )
+
+
+class JSONEditorModalWidget(JSONEditorWidget):
+    """
+    A compact variant for changelists and tabular inlines: each cell renders
+    a short preview and a hidden input, and a single JSONEditor shared by the
+    whole page is opened in a modal to edit whichever cell was clicked.
+    """
+    class Media:
+        js = ('js/django_json_widget_modal.js',)
+        css = {  # noqa: RUF012
+            'all': ('css/django_json_widget.css',)
+        }
+
+    template_name = 'django_json_widget_modal.html'
+
+    def __init__(self, attrs=None, mode='code', options=None, preview_length=60):
+        self.preview_length = preview_length
+        super().__init__(attrs=attrs, mode=mode, options=options)
+
+    def format_value(self, value):
+        # The cell only holds the JSON text, so it is passed through unparsed.
+        return value if isinstance(value, str) else json.dumps(value)
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        text = context['widget']['value']
+        context['widget']['json'] = text
+        context['widget']['preview_length'] = self.preview_length
+        context['widget']['preview'] = preview(text, self.preview_length)
+        return context
+
+
+def preview(text, length):
+    """Truncate JSON text for display, marking the cut with an ellipsis."""
+    if len(text) <= length:
+        return text
+    return text[:length - 1] + '…'
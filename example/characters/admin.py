@@ -1,11 +1,13 @@
 from django.contrib import admin
 from django.db.models import JSONField
 from .models import Character
+from django_json_widget.actions import bulk_edit_json
 from django_json_widget.widgets import JSONEditorWidget
 
 
 @admin.register(Character)
 class CharacterAdmin(admin.ModelAdmin):
+    actions = (bulk_edit_json,)
     formfield_overrides = {
         JSONField: {'widget': JSONEditorWidget},
     }
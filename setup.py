@@ -54,6 +54,9 @@ setup(
     url='https://github.com/jmrivas86/django-json-widget',
     packages=[
         'django_json_widget',
+        'django_json_widget.management',
+        'django_json_widget.management.commands',
+        'django_json_widget.migrations',
     ],
     include_package_data=True,
     license="MIT",
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from django.db.models import JSONField
+
+from django_json_widget.actions import bulk_edit_json, export_ndjson
+from django_json_widget.admin import JSONPreviewMixin, NDJSONImportMixin, json_preview
+from django_json_widget.widgets import JSONEditorWidget
+
+from .models import Document
+
+
+@admin.register(Document)
+class DocumentAdmin(JSONPreviewMixin, NDJSONImportMixin, admin.ModelAdmin):
+    list_display = ('name', json_preview('data', 'stats__hp'), json_preview('data', length=20))
+    actions = (bulk_edit_json, export_ndjson)
+    json_bulk_edit_chunk_size = 2
+    ndjson_chunk_size = 2
+    formfield_overrides = {  # noqa: RUF012
+        JSONField: {'widget': JSONEditorWidget},
+    }
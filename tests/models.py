@@ -0,0 +1,23 @@
+from django.db import models
+
+from django_json_widget.models import CompressedJSONField, SharedJSONField
+
+
+class Document(models.Model):
+    name = models.CharField(max_length=200)
+    data = models.JSONField(default=dict)
+    other_data = models.JSONField(default=dict, blank=True)
+
+    def __str__(self):
+        return self.name
+
+
+class CompressedDocument(models.Model):
+    data = CompressedJSONField(default=dict)
+    plain = models.JSONField(null=True, blank=True)
+
+
+class SharedDocument(models.Model):
+    name = models.CharField(max_length=200, blank=True)
+    config = SharedJSONField(default=dict)
+    extra = SharedJSONField(null=True, blank=True)
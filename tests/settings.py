@@ -12,15 +12,27 @@ DATABASES = {
 }
 
 INSTALLED_APPS = [
+    "django.contrib.admin",
     "django.contrib.auth",
     "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
     "django.contrib.sites",
     "django_json_widget",
+    "tests",
 ]
 
 SITE_ID = 1
 
-MIDDLEWARE = ()
+DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+MIDDLEWARE = (
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+)
+
+ROOT_URLCONF = "tests.urls"
 
 # JSON Editor Widget Settings
 JSON_EDITOR_JS = 'dist/jsoneditor.min.js'
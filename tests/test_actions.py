@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+"""
+test_actions
+------------
+
+Tests for JSON patching and the bulk JSON edit admin action.
+"""
+
+import json
+
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from django_json_widget.actions import JSON_PATCH, MERGE_PATCH, bulk_patch
+from django_json_widget.patch import PatchError, apply_json_patch, apply_merge_patch
+
+from .models import Document
+
+
+class JSONPatchTests(TestCase):
+    """Test RFC 6902 and RFC 7396 patching"""
+
+    def test_operations(self):
+        document = {"a": {"b": [1, 2]}, "c": "x", "d~/e": 1}
+        patch = [
+            {"op": "add", "path": "/a/b/-", "value": 3},
+            {"op": "add", "path": "/a/b/0", "value": 0},
+            {"op": "replace", "path": "/c", "value": "y"},
+            {"op": "remove", "path": "/d~0~1e"},
+            {"op": "copy", "from": "/a/b", "path": "/copied"},
+            {"op": "move", "from": "/c", "path": "/moved"},
+            {"op": "test", "path": "/a/b/1", "value": 1.0},
+        ]
+        result = apply_json_patch(document, patch)
+        self.assertEqual(result, {"a": {"b": [0, 1, 2, 3]}, "copied": [0, 1, 2, 3], "moved": "y"})
+        self.assertEqual(document, {"a": {"b": [1, 2]}, "c": "x", "d~/e": 1})
+
+    def test_failures(self):
+        cases = [
+            [{"op": "remove", "path": "/missing"}],
+            [{"op": "replace", "path": "/a/5", "value": 1}],
+            [{"op": "test", "path": "/a/0", "value": True}],
+            [{"op": "move", "from": "/a", "path": "/a/0"}],
+            [{"op": "add", "path": "/a/01", "value": 1}],
+            [{"op": "unknown", "path": "/a"}],
+            [{"op": "add", "path": "a", "value": 1}],
+            {"op": "add"},
+        ]
+        for patch in cases:
+            with self.subTest(patch=patch), self.assertRaises(PatchError):
+                apply_json_patch({"a": [1]}, patch)
+
+    def test_merge_patch(self):
+        document = {"a": "b", "c": {"d": "e", "f": "g"}}
+        patch = {"a": "z", "c": {"f": None}, "n": {"x": 1}}
+        self.assertEqual(apply_merge_patch(document, patch), {"a": "z", "c": {"d": "e"}, "n": {"x": 1}})
+        self.assertEqual(apply_merge_patch(document, ["replaced"]), ["replaced"])
+        self.assertEqual(document, {"a": "b", "c": {"d": "e", "f": "g"}})
+
+
+class BulkPatchTests(TestCase):
+    """Test chunked application of a patch to a queryset"""
+
+    def setUp(self):
+        Document.objects.bulk_create(
+            [Document(name=f"doc {i}", data={"version": 1, "id": i}) for i in range(7)]
+            + [Document(name="list", data=[])]
+        )
+
+    def test_bulk_patch_in_chunks(self):
+        progress = []
+        patch = [{"op": "replace", "path": "/version", "value": 2}]
+        # One chunked read, plus one UPDATE per batch of 2 changed rows.
+        with self.assertNumQueries(1 + 4):
+            result = bulk_patch(Document.objects.all(), "data", patch, chunk_size=2, progress=progress.append)
+
+        self.assertEqual((result.processed, result.updated, result.failed), (8, 7, 1))
+        self.assertEqual(result.failures[0][0], Document.objects.get(name="list").pk)
+        self.assertEqual([p.processed for p in progress], [2, 4, 6, 8, 8])
+        self.assertFalse(Document.objects.filter(data__version=1).exists())
+        self.assertEqual(Document.objects.get(name="list").data, [])
+
+    def test_unchanged_rows_are_not_written(self):
+        patch = {"version": 1}
+        result = bulk_patch(Document.objects.all(), "data", patch, MERGE_PATCH, chunk_size=3)
+        self.assertEqual((result.processed, result.updated), (8, 1))
+
+
+class BulkEditActionTests(TestCase):
+    """Test the admin action end to end"""
+
+    def setUp(self):
+        self.user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(self.user)
+        self.docs = [Document.objects.create(name=f"doc {i}", data={"tags": []}) for i in range(5)]
+        self.url = reverse("admin:tests_document_changelist")
+
+    def post_action(self, **extra):
+        data = {
+            "action": "bulk_edit_json",
+            "index": 0,
+            helpers.ACTION_CHECKBOX_NAME: [doc.pk for doc in self.docs[:3]],
+        }
+        data.update(extra)
+        return self.client.post(self.url, data)
+
+    def test_intermediate_page(self):
+        response = self.post_action()
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "django_json_widget/bulk_edit_json.html")
+        self.assertContains(response, 'name="json_edit_apply"')
+        self.assertContains(response, "new JSONEditor")
+        for doc in self.docs[:3]:
+            self.assertContains(response, f'name="_selected_action" value="{doc.pk}"')
+        self.assertNotContains(response, "__unchanged")
+
+    def test_untouched_patch_editor_posts_its_text(self):
+        # Without the marker the untouched editor posts its empty patch,
+        # which is reported as missing rather than as a stale document.
+        response = self.post_action(**{
+            "json_edit_apply": "yes",
+            "json_edit-field": "data",
+            "json_edit-patch_type": JSON_PATCH,
+            "json_edit-patch": "[]",
+        })
+        self.assertContains(response, "This field is required.")
+        self.assertNotContains(response, "The stored value has changed")
+
+    def test_apply_patch(self):
+        response = self.post_action(**{
+            "json_edit_apply": "yes",
+            "json_edit-field": "data",
+            "json_edit-patch_type": JSON_PATCH,
+            "json_edit-patch": json.dumps([{"op": "add", "path": "/tags/-", "value": "bulk"}]),
+        })
+        self.assertRedirects(response, self.url)
+        self.assertEqual(Document.objects.filter(data__tags=["bulk"]).count(), 3)
+        messages = [str(m) for m in response.wsgi_request._messages]
+        self.assertTrue(any(m.startswith("Updated 3 of 3 objects in ") for m in messages))
+
+    def test_select_across_and_failures(self):
+        Document.objects.filter(pk=self.docs[4].pk).update(data={})
+        response = self.post_action(**{
+            "select_across": 1,
+            "json_edit_apply": "yes",
+            "json_edit-field": "data",
+            "json_edit-patch_type": JSON_PATCH,
+            "json_edit-patch": json.dumps([{"op": "add", "path": "/tags/-", "value": "bulk"}]),
+        })
+        self.assertRedirects(response, self.url)
+        self.assertEqual(Document.objects.filter(data__tags=["bulk"]).count(), 4)
+        messages = [str(m) for m in response.wsgi_request._messages]
+        self.assertTrue(any(m.startswith("Updated 4 of 5 objects in ") for m in messages))
+        self.assertTrue(any(m.startswith(f"The patch could not be applied to 1 object: {self.docs[4].pk}:")
+                            for m in messages))
+
+    def test_invalid_patch_redisplays_form(self):
+        response = self.post_action(**{
+            "json_edit_apply": "yes",
+            "json_edit-field": "data",
+            "json_edit-patch_type": JSON_PATCH,
+            "json_edit-patch": json.dumps({"op": "add"}),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "A JSON Patch must be a list of operations.")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+
+"""
+test_autocomplete
+-----------------
+
+Tests for key and value suggestions drawn from existing data.
+"""
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_json_widget import autocomplete
+from django_json_widget.widgets import JSONEditorWidget
+
+from .models import Document
+
+
+class SuggestTests(TestCase):
+    """Test the cached index"""
+
+    def setUp(self):
+        cache.clear()
+        autocomplete._sorted.clear()
+        Document.objects.create(
+            name="a", data={"stats": {"hp": 10, "height": 2}, "race": "Human", "tags": [{"kind": "x"}]},
+        )
+        Document.objects.create(name="b", data={"stats": {"mp": 4}, "race": "Hobbit", "tags": [{"kind": "y"}]})
+
+    def suggest(self, kind, path, prefix=""):
+        return autocomplete.suggest(Document, "data", kind, path, prefix)
+
+    def test_keys(self):
+        self.assertEqual(self.suggest("key", ["stats", ""]), ["height", "hp", "mp"])
+        self.assertEqual(self.suggest("key", ["stats", "h"], "h"), ["height", "hp"])
+        self.assertEqual(self.suggest("key", ["r"], "r"), ["race"])
+        self.assertEqual(self.suggest("key", ["tags", 3, "k"], "k"), ["kind"])
+
+    def test_values(self):
+        self.assertEqual(self.suggest("value", ["race"], "H"), ["Hobbit", "Human"])
+        self.assertEqual(self.suggest("value", ["race"], "Hu"), ["Human"])
+        self.assertEqual(self.suggest("value", ["tags", 0, "kind"]), ["x", "y"])
+        self.assertEqual(self.suggest("value", ["stats", "hp"]), [])
+
+    def test_limit(self):
+        self.assertEqual(autocomplete.suggest(Document, "data", "key", ["stats", ""], limit=1), ["height"])
+
+    def test_index_is_cached(self):
+        self.suggest("key", [""])
+        with self.assertNumQueries(0), mock.patch.object(autocomplete.cache, "get") as get:
+            self.suggest("key", [""])
+        get.assert_not_called()
+
+    def test_tracked_keys_capped(self):
+        Document.objects.create(name="c", data={"wide": {f"k{i}": {"n": i} for i in range(5)}})
+        with mock.patch.object(autocomplete, "MAX_TRACKED_KEYS", 3):
+            self.assertEqual(self.suggest("key", ["wide", ""]), ["k0", "k1", "k2"])
+        state = cache.get(autocomplete._cache_key("tests.Document", "data"))
+        self.assertNotIn(("wide", "k3"), state["keys"])
+
+    def test_refresh_scans_new_rows_only(self):
+        self.suggest("key", [""])
+        Document.objects.create(name="c", data={"level": 3})
+        self.assertEqual(self.suggest("key", ["l"], "l"), [])
+
+        state = cache.get(autocomplete._cache_key("tests.Document", "data"))
+        with mock.patch("django_json_widget.autocomplete.time.time", return_value=state["refreshed"] + 301):
+            self.assertEqual(self.suggest("key", ["l"], "l"), ["level"])
+        state = cache.get(autocomplete._cache_key("tests.Document", "data"))
+        self.assertEqual(state["rows"], 3)
+
+    @override_settings(JSON_EDITOR_AUTOCOMPLETE_SAMPLE_SIZE=1)
+    def test_sample_of_recent_rows(self):
+        self.assertEqual(self.suggest("value", ["race"]), ["Hobbit"])
+
+    def test_get_field_model(self):
+        self.assertEqual(autocomplete.get_field_model("tests.document.data"), (Document, "data"))
+        for label in ("tests.document.name", "tests.document", "tests.missing.data"):
+            with self.assertRaises(LookupError):
+                autocomplete.get_field_model(label)
+
+
+class AutocompleteViewTests(TestCase):
+    """Test the endpoint used by the widget"""
+
+    def setUp(self):
+        cache.clear()
+        autocomplete._sorted.clear()
+        Document.objects.create(name="a", data={"race": "Human"})
+        self.url = reverse("django_json_widget:autocomplete", args=["tests.document.data"])
+        self.user = User.objects.create_user("staff", password="x", is_staff=True)
+        self.client.force_login(self.user)
+
+    def test_requires_view_permission(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+        self.user.user_permissions.add(Permission.objects.get(codename="view_document"))
+        response = self.client.get(self.url, {"kind": "value", "path": '["race"]', "prefix": "H"})
+        self.assertEqual(response.json(), {"results": ["Human"]})
+
+    def test_requires_staff(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_bad_requests(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="view_document"))
+        self.assertEqual(self.client.get(self.url, {"path": "["}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"kind": "other"}).status_code, 400)
+        missing = reverse("django_json_widget:autocomplete", args=["tests.document.name"])
+        self.assertEqual(self.client.get(missing).status_code, 404)
+
+
+class AutocompleteWidgetTests(TestCase):
+    """Test the widget option"""
+
+    def test_render(self):
+        html = JSONEditorWidget(autocomplete="tests.document.data").render("data", {})
+        self.assertIn("getOptions", html)
+        self.assertIn('fetch("/json\\u002Dwidget/autocomplete/tests.document.data/"', html)
+        self.assertNotIn("getOptions", JSONEditorWidget().render("data", {}))
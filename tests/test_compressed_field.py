@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""
+test_compressed_field
+---------------------
+
+Tests for `CompressedJSONField`.
+"""
+from unittest import mock
+
+from django import forms
+from django.apps import apps
+from django.core import serializers
+from django.db import connection
+from django.test import TestCase
+
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.models import PLAIN, ZLIB, CompressedJSON, CompressedJSONField, copy_json_field
+from django_json_widget.widgets import JSONEditorWidget
+
+from .models import CompressedDocument
+
+DOCUMENT = {"characters": [{"name": "Frodo", "race": "Hobbit", "stats": {"hp": 10}}] * 50}
+
+
+def stored(pk):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT data FROM tests_compresseddocument WHERE id = %s", [pk])
+        return bytes(cursor.fetchone()[0])
+
+
+class CompressedJSONFieldTests(TestCase):
+
+    def test_round_trip(self):
+        doc = CompressedDocument.objects.create(data=DOCUMENT)
+        self.assertEqual(CompressedDocument.objects.get().data, DOCUMENT)
+        payload = stored(doc.pk)
+        self.assertEqual(payload[:1], ZLIB)
+        self.assertLess(len(payload), len(str(DOCUMENT)) / 10)
+
+    def test_small_documents_are_stored_plain(self):
+        doc = CompressedDocument.objects.create(data={"a": 1})
+        self.assertEqual(stored(doc.pk), PLAIN + b'{"a": 1}')
+        self.assertEqual(CompressedDocument.objects.get().data, {"a": 1})
+
+    def test_decoded_on_first_access(self):
+        CompressedDocument.objects.create(data=DOCUMENT)
+        doc = CompressedDocument.objects.get()
+        self.assertIsInstance(doc.__dict__["data"], CompressedJSON)
+        with mock.patch("django_json_widget.models.json.loads", wraps=__import__("json").loads) as loads:
+            self.assertEqual(doc.data, DOCUMENT)
+            self.assertEqual(doc.data, DOCUMENT)
+        self.assertEqual(loads.call_count, 1)
+        self.assertEqual(doc.__dict__["data"], DOCUMENT)
+
+    def test_untouched_value_saved_without_encoding(self):
+        CompressedDocument.objects.create(data=DOCUMENT)
+        doc = CompressedDocument.objects.get()
+        with mock.patch("django_json_widget.models._compress") as compress:
+            doc.save()
+        compress.assert_not_called()
+        self.assertEqual(CompressedDocument.objects.get().data, DOCUMENT)
+
+        doc.data["characters"] = []
+        doc.save()
+        self.assertEqual(CompressedDocument.objects.get().data, {"characters": []})
+
+    def test_deferred_and_values(self):
+        CompressedDocument.objects.create(data=DOCUMENT)
+        doc = CompressedDocument.objects.defer("data").get()
+        self.assertEqual(doc.data, DOCUMENT)
+        payload = CompressedDocument.objects.values_list("data", flat=True).get()
+        self.assertIsInstance(payload, CompressedJSON)
+        self.assertEqual(payload.load(), DOCUMENT)
+
+    def test_null(self):
+        field = CompressedJSONField(null=True)
+        self.assertIsNone(field.get_prep_value(None))
+        self.assertIsNone(field.from_db_value(None, None, connection))
+
+    def test_formfield(self):
+        class CompressedDocumentForm(forms.ModelForm):
+            class Meta:
+                model = CompressedDocument
+                fields = ("data",)
+
+        form_field = CompressedDocumentForm.base_fields["data"]
+        self.assertIsInstance(form_field, JSONEditorField)
+        self.assertIsInstance(form_field.widget, JSONEditorWidget)
+
+        form = CompressedDocumentForm({"data": '{"b": 2}'})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(CompressedDocument.objects.get(pk=form.save().pk).data, {"b": 2})
+
+    def test_serialization(self):
+        CompressedDocument.objects.create(data={"a": [1, 2]})
+        data = serializers.serialize("json", CompressedDocument.objects.all())
+        self.assertIn('"data": {"a": [1, 2]}', data)
+        CompressedDocument.objects.all().delete()
+        for obj in serializers.deserialize("json", data):
+            obj.save()
+        self.assertEqual(CompressedDocument.objects.get().data, {"a": [1, 2]})
+
+    def test_deconstruct(self):
+        _name, path, _args, kwargs = CompressedJSONField(threshold=1024, level=9).deconstruct()
+        self.assertEqual(path, "django_json_widget.models.CompressedJSONField")
+        self.assertEqual(kwargs, {"threshold": 1024, "level": 9})
+        self.assertEqual(CompressedJSONField(editable=False).deconstruct()[3], {"editable": False})
+
+    def test_check(self):
+        field = CompressedJSONField(algorithm="lzma")
+        field.set_attributes_from_name("data")
+        field.model = CompressedDocument
+        self.assertEqual([error.id for error in field.check()], ["django_json_widget.E001"])
+
+
+class CopyJSONFieldTests(TestCase):
+    """Test the data migration helper"""
+
+    def test_copy_both_ways(self):
+        operation = copy_json_field("tests", "CompressedDocument", "plain", "data", chunk_size=2)
+        docs = [CompressedDocument.objects.create(plain={"i": i}) for i in range(5)]
+        schema_editor = mock.Mock(connection=connection)
+        operation.code(apps, schema_editor)
+        self.assertEqual([doc.data for doc in CompressedDocument.objects.order_by("pk")], [{"i": i} for i in range(5)])
+
+        CompressedDocument.objects.update(plain=None)
+        operation.reverse_code(apps, schema_editor)
+        self.assertEqual(CompressedDocument.objects.get(pk=docs[3].pk).plain, {"i": 3})
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+test_compression
+----------------
+
+Tests for compressed submission of large documents.
+"""
+
+import base64
+import gzip
+import json
+import zlib
+
+from django.forms import Form, JSONField
+from django.test import TestCase
+
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.parsing import LimitExceeded, decompress
+from django_json_widget.widgets import InvalidCompressedInput, JSONEditorWidget
+
+DOCUMENT = {"items": [{"id": i, "name": f"item {i}"} for i in range(100)]}
+
+
+def gzipped(value):
+    return base64.b64encode(gzip.compress(value.encode("utf-8"))).decode("ascii")
+
+
+class DecompressTests(TestCase):
+    """Test decoding of compressed submissions"""
+
+    def test_gzip_and_deflate(self):
+        text = json.dumps(DOCUMENT)
+        deflated = base64.b64encode(zlib.compress(text.encode("utf-8"))).decode("ascii")
+        self.assertEqual(decompress(gzipped(text), "gzip", 10 ** 6), text)
+        self.assertEqual(decompress(deflated, "deflate", 10 ** 6), text)
+
+    def test_decompression_bomb_rejected(self):
+        bomb = base64.b64encode(gzip.compress(b"0" * (50 * 1024 * 1024))).decode("ascii")
+        with self.assertRaises(LimitExceeded):
+            decompress(bomb, "gzip", 1024 * 1024)
+
+    def test_malformed_input(self):
+        for value, encoding in (("not base64!", "gzip"), ("aGVsbG8=", "gzip"), (gzipped("{}")[:-8], "gzip"),
+                                (gzipped("{}"), "br")):
+            with self.subTest(value=value, encoding=encoding), self.assertRaises(ValueError):
+                decompress(value, encoding, 1024)
+
+
+class CompressedWidgetTests(TestCase):
+    """Test the widget's handling of the compressed marker"""
+
+    def test_disabled_by_default(self):
+        widget = JSONEditorWidget()
+        html = widget.render("doc", "{}", {"id": "id_doc"})
+        self.assertNotIn("CompressionStream", html)
+        data = {"doc": gzipped("{}"), "doc__compressed": "gzip"}
+        self.assertEqual(widget.value_from_datadict(data, {}, "doc"), data["doc"])
+
+    def test_render(self):
+        html = JSONEditorWidget(compress_threshold=1024).render("doc", "{}", {"id": "id_doc"})
+        self.assertIn('name="doc__compressed" value="gzip" disabled', html)
+        self.assertIn("var threshold = 1024;", html)
+
+    def test_value_from_datadict(self):
+        widget = JSONEditorWidget(compress_threshold=0, max_decompressed_size=1024)
+        text = json.dumps({"a": 1})
+        data = {"doc": gzipped(text), "doc__compressed": "gzip"}
+        self.assertEqual(widget.value_from_datadict(data, {}, "doc"), text)
+        self.assertEqual(widget.value_from_datadict({"doc": text}, {}, "doc"), text)
+
+        value = widget.value_from_datadict({"doc": gzipped("1" * 2048), "doc__compressed": "gzip"}, {}, "doc")
+        self.assertIsInstance(value, InvalidCompressedInput)
+        self.assertEqual(value.code, "max_decompressed_size")
+
+
+class DocumentForm(Form):
+    document = JSONEditorField(widget=JSONEditorWidget(compress_threshold=0, max_decompressed_size=64 * 1024))
+
+
+class CompressedFormTests(TestCase):
+    """Test compressed submissions through a form"""
+
+    def test_valid_submission(self):
+        form = DocumentForm({"document": gzipped(json.dumps(DOCUMENT)), "document__compressed": "gzip"})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["document"], DOCUMENT)
+
+    def test_errors(self):
+        cases = {
+            "max_decompressed_size": gzipped("[" + "1," * 64 * 1024 + "1]"),
+            "invalid_compressed": "garbage",
+        }
+        for code, value in cases.items():
+            with self.subTest(code=code):
+                form = DocumentForm({"document": value, "document__compressed": "gzip"}, initial={"document": {}})
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.errors.as_data()["document"][0].code, code)
+                self.assertIn("document", str(form["document"]))
+
+    def test_errors_with_plain_json_field(self):
+        class PlainForm(Form):
+            document = JSONField(widget=JSONEditorWidget(compress_threshold=0, max_decompressed_size=1024))
+
+        for value in (gzipped("1" * 2048), "garbage"):
+            with self.subTest(value=value[:10]):
+                form = PlainForm({"document": value, "document__compressed": "gzip"})
+                self.assertFalse(form.is_valid())
+                html = str(form["document"])
+                self.assertIn('<script id="document_data" type="application/json">null</script>', html)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+
+"""
+test_memory
+-----------
+
+Peak and retained memory budgets for the render and submit paths.
+
+Each scenario is a document of about 1 MB. Budgets are stored in
+``memory_budgets.json`` as multiples of the document's JSON text size, so
+another full copy of the document on any path pushes it over budget.
+Allocation sizes differ between Python versions by more than that, so
+budgets are kept per Python version (the tested Django versions differ by
+well under the headroom). After an intended change, recalibrate the running
+interpreter's budgets with::
+
+    JSON_WIDGET_UPDATE_MEMORY_BUDGETS=1 python manage.py test tests.test_memory
+
+once per Python version in the tox matrix.
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+from django.forms import Form
+from django.test import SimpleTestCase
+
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.widgets import JSONEditorWidget
+
+BUDGETS_FILE = Path(__file__).parent / "memory_budgets.json"
+UPDATE_BUDGETS = bool(os.environ.get("JSON_WIDGET_UPDATE_MEMORY_BUDGETS"))
+PYTHON_VERSION = "{}.{}".format(*sys.version_info[:2])
+
+# Headroom added to measured peaks when recalibrating, in document sizes.
+# Below 1.0, so an extra copy of the document is always caught.
+PEAK_HEADROOM = 0.75
+RETAINED_BUDGET = 0.05
+
+SIZE = 1024 * 1024
+
+
+def wide_object():
+    return {f"key_{i:06d}": i for i in range(SIZE // 16)}
+
+
+def long_array():
+    return list(range(SIZE // 8))
+
+
+def deep_nesting():
+    document = "leaf"
+    for level in range(500):
+        document = {"level": level, "pad": "y" * (SIZE // 500), "child": document}
+    return document
+
+
+def large_string():
+    return {"blob": "x" * SIZE}
+
+
+SCENARIOS = {
+    "wide_object": wide_object,
+    "long_array": long_array,
+    "deep_nesting": deep_nesting,
+    "large_string": large_string,
+}
+
+
+class DocumentForm(Form):
+    document = JSONEditorField(required=False)
+
+
+def clean(text):
+    form = DocumentForm({"document": text}, initial={"document": None})
+    assert form.is_valid()
+    return form.changed_data
+
+
+OPERATIONS = {
+    "format_value": lambda text: JSONEditorWidget().format_value(text),
+    "get_context": lambda text: JSONEditorWidget().get_context("document", text, {"id": "id_document"}),
+    "render": lambda text: JSONEditorWidget().render("document", text, {"id": "id_document"}),
+    "clean": clean,
+}
+
+
+def measure(operation, text):
+    """Return the peak and retained allocations of ``operation(text)``."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        operation(text)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, retained
+
+
+class MemoryBudgetTests(SimpleTestCase):
+    """Check every scenario and operation against its checked-in budget"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.all_budgets = json.loads(BUDGETS_FILE.read_text()) if BUDGETS_FILE.exists() else {}
+        cls.budgets = cls.all_budgets.get(PYTHON_VERSION)
+        cls.measured = {}
+        # Warm up template loading and other one-off caches.
+        for operation in OPERATIONS.values():
+            operation("{\"warm\": \"up\"}")
+
+    @classmethod
+    def tearDownClass(cls):
+        if UPDATE_BUDGETS:
+            budgets = dict(cls.all_budgets, **{PYTHON_VERSION: cls.measured})
+            BUDGETS_FILE.write_text(json.dumps(budgets, indent=2, sort_keys=True) + "\n")
+        super().tearDownClass()
+
+    def test_budgets(self):
+        if self.budgets is None and not UPDATE_BUDGETS:
+            self.skipTest(f"No memory budgets for Python {PYTHON_VERSION}, recalibrate the budgets file")
+        for scenario, build in SCENARIOS.items():
+            text = json.dumps(build())
+            for name, operation in OPERATIONS.items():
+                key = f"{scenario}.{name}"
+                peak, retained = measure(operation, text)
+                peak_ratio, retained_ratio = peak / len(text), retained / len(text)
+                self.measured[key] = {"peak": round(peak_ratio + PEAK_HEADROOM, 2), "retained": RETAINED_BUDGET}
+                if UPDATE_BUDGETS:
+                    continue
+
+                with self.subTest(key):
+                    self.assertIn(key, self.budgets, f"No budget for {key}, recalibrate the budgets file")
+                    budget = self.budgets[key]
+                    self.assertLessEqual(
+                        peak_ratio, budget["peak"],
+                        f"{key} peaked at {peak_ratio:.2f}x the document size (budget {budget['peak']:.2f}x)",
+                    )
+                    self.assertLessEqual(
+                        retained_ratio, budget["retained"],
+                        f"{key} retained {retained_ratio:.2f}x the document size "
+                        f"(budget {budget['retained']:.2f}x)",
+                    )
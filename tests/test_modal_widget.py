@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+test_modal_widget
+-----------------
+
+Tests for the compact widget sharing one modal editor per page.
+"""
+
+import json
+from unittest import mock
+
+from django.forms import Form, JSONField, formset_factory
+from django.test import TestCase
+
+from django_json_widget.widgets import JSONEditorModalWidget
+
+
+class JSONEditorModalWidgetTests(TestCase):
+    """Test rendering and submission of the compact widget"""
+
+    def test_render_has_no_editor_instance(self):
+        html = JSONEditorModalWidget().render("data", '{"key": "value"}', {"id": "id_data"})
+
+        self.assertIn('type="hidden" id="id_data" name="data"', html)
+        self.assertNotIn("data-target", html)
+        self.assertIn("{&quot;key&quot;: &quot;value&quot;}", html)
+        self.assertNotIn("new JSONEditor", html)
+        self.assertNotIn("<script>", html)
+
+    def test_preview_is_truncated(self):
+        widget = JSONEditorModalWidget(preview_length=10)
+        context = widget.get_context("data", {"key": "a long value"}, {"id": "id_data"})
+
+        self.assertEqual(context["widget"]["preview"], '{"key": "…')
+        self.assertEqual(json.loads(context["widget"]["json"]), {"key": "a long value"})
+
+    def test_text_is_not_parsed(self):
+        with mock.patch("django_json_widget.widgets.json.loads") as loads:
+            html = JSONEditorModalWidget().render("data", '{"key": "value"}', {"id": "id_data"})
+        loads.assert_not_called()
+        self.assertIn("{&quot;key&quot;: &quot;value&quot;}", html)
+
+    def test_options_rendered_on_input(self):
+        html = JSONEditorModalWidget(mode="tree").render("data", "{}", {"id": "id_data"})
+        self.assertIn("&quot;mode&quot;: &quot;tree&quot;", html)
+
+    def test_media_includes_shared_script(self):
+        media = str(JSONEditorModalWidget().media)
+        self.assertIn("dist/jsoneditor.min.js", media)
+        self.assertIn("js/django_json_widget_modal.js", media)
+        self.assertIn("css/django_json_widget.css", media)
+
+    def test_formset_roundtrip(self):
+        class RowForm(Form):
+            data = JSONField(widget=JSONEditorModalWidget())
+
+        RowFormSet = formset_factory(RowForm, extra=0)
+        initial = [{"data": {"row": i}} for i in range(3)]
+        html = str(RowFormSet(initial=initial))
+        self.assertEqual(html.count("django-json-widget-preview"), 3)
+
+        data = {"form-TOTAL_FORMS": "3", "form-INITIAL_FORMS": "3"}
+        data.update({f"form-{i}-data": json.dumps({"row": i * 10}) for i in range(3)})
+        formset = RowFormSet(data, initial=initial)
+        self.assertTrue(formset.is_valid())
+        self.assertEqual([form.cleaned_data["data"] for form in formset], [{"row": 0}, {"row": 10}, {"row": 20}])
+
+    def test_empty_form_row_has_no_id_reference(self):
+        class RowForm(Form):
+            data = JSONField(widget=JSONEditorModalWidget())
+
+        html = str(formset_factory(RowForm)().empty_form["data"])
+        # The preview finds the input in its own cell, so copies of the
+        # template row keep working once their ids are renumbered.
+        self.assertRegex(
+            html,
+            r'<span class="django-json-widget-cell">\s*<button [^>]*class="django-json-widget-preview"[^>]*>'
+            r'[^<]*</button>\s*<input type="hidden" id="id_form-__prefix__-data"',
+        )
+        self.assertNotIn("data-target", html)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+
+"""
+test_ndjson
+-----------
+
+Tests for streaming NDJSON export and import of JSON fields.
+"""
+
+import json
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from django_json_widget import ndjson
+from django_json_widget.ndjson import import_ndjson, iter_ndjson
+
+from .models import Document
+
+
+class NDJSONTests(TestCase):
+    """Test the export generator and the import loop"""
+
+    def setUp(self):
+        self.docs = [Document.objects.create(name=f"doc {i}", data={"i": i, "s": "é"}) for i in range(5)]
+
+    def test_export(self):
+        lines = "".join(iter_ndjson(Document.objects.all(), ["data"], chunk_size=2)).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[0]), {"pk": self.docs[0].pk, "data": {"i": 0, "s": "é"}})
+
+    def test_export_buffers_small_rows(self):
+        self.assertEqual(len(list(iter_ndjson(Document.objects.all(), ["data", "other_data"]))), 1)
+        with mock.patch.object(ndjson, "WRITE_BUFFER_SIZE", 1):
+            self.assertEqual(len(list(iter_ndjson(Document.objects.all(), ["data"]))), 5)
+
+    def test_roundtrip(self):
+        export = "".join(iter_ndjson(Document.objects.all(), ["data"]))
+        Document.objects.update(data={})
+        result = import_ndjson(export.encode("utf-8").splitlines(True), Document.objects.all(), ["data"], 2)
+        self.assertEqual((result.processed, result.updated, result.failed), (5, 5, 0))
+        self.assertEqual(Document.objects.get(pk=self.docs[3].pk).data, {"i": 3, "s": "é"})
+
+    def test_import_validation(self):
+        lines = [
+            json.dumps({"pk": self.docs[0].pk, "data": {"new": 1}}),
+            "",
+            "not json",
+            json.dumps([1]),
+            json.dumps({"pk": self.docs[1].pk, "name": "x"}),
+            json.dumps({"pk": self.docs[1].pk}),
+            json.dumps({"pk": "abc", "data": {}}),
+            json.dumps({"pk": 999, "data": {}}),
+            json.dumps({"pk": self.docs[2].pk, "other_data": [1]}),
+        ]
+        queryset = Document.objects.exclude(pk=self.docs[4].pk)
+        result = import_ndjson(lines, queryset, ["data", "other_data"], chunk_size=3)
+
+        self.assertEqual((result.processed, result.updated, result.failed), (8, 2, 6))
+        self.assertEqual([number for number, _message in result.failures], [3, 4, 5, 6, 7, 8])
+        self.assertEqual(Document.objects.get(pk=self.docs[0].pk).data, {"new": 1})
+        self.assertEqual(Document.objects.get(pk=self.docs[2].pk).other_data, [1])
+        self.assertEqual(Document.objects.get(pk=self.docs[1].pk).name, "doc 1")
+
+
+class NDJSONAdminTests(TestCase):
+    """Test the export action and the import page"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        self.docs = [Document.objects.create(name=f"doc {i}", data={"i": i}) for i in range(3)]
+        self.url = reverse("admin:tests_document_changelist")
+
+    def test_export_action_streams(self):
+        response = self.client.post(self.url, {
+            "action": "export_ndjson",
+            "index": 0,
+            helpers.ACTION_CHECKBOX_NAME: [self.docs[0].pk, self.docs[2].pk],
+        })
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson; charset=utf-8")
+        self.assertIn('filename="document.ndjson"', response["Content-Disposition"])
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual([json.loads(line)["data"]["i"] for line in lines], [0, 2])
+
+    def test_import_page(self):
+        import_url = reverse("admin:tests_document_import_ndjson")
+        self.assertContains(self.client.get(self.url), import_url)
+        self.assertEqual(self.client.get(import_url).status_code, 200)
+
+        content = "\n".join(json.dumps({"pk": doc.pk, "data": {"imported": True}}) for doc in self.docs)
+        upload = SimpleUploadedFile("docs.ndjson", (content + "\nbroken\n").encode("utf-8"))
+        response = self.client.post(import_url, {"file": upload})
+
+        self.assertRedirects(response, self.url)
+        self.assertEqual(Document.objects.filter(data__imported=True).count(), 3)
+        messages = [str(m) for m in response.wsgi_request._messages]
+        self.assertTrue(messages[0].startswith("Imported 3 of 4 lines in "))
+        self.assertEqual(messages[1], "1 line was skipped: line 4: Expecting value: line 1 column 1 (char 0)")
+
+    def test_import_requires_change_permission(self):
+        user = User.objects.create_user("viewer", password="pw", is_staff=True)
+        self.client.force_login(user)
+        response = self.client.get(reverse("admin:tests_document_import_ndjson"))
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""
+test_parsing
+------------
+
+Tests for the size, depth and node limits on submitted documents.
+"""
+
+import time
+import tracemalloc
+from unittest import mock
+
+from django.core.exceptions import ValidationError
+from django.forms import Form
+from django.test import TestCase
+
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.parsing import LimitExceeded, check_limits
+
+
+class CheckLimitsTests(TestCase):
+    """Test the structural scanner"""
+
+    def test_within_limits(self):
+        check_limits('{"a": [1, 2, {"b": "x"}]}', max_bytes=100, max_depth=3, max_nodes=6)
+
+    def test_max_bytes_counts_utf8(self):
+        with self.assertRaises(LimitExceeded) as cm:
+            check_limits('"ééé"', max_bytes=6)
+        self.assertEqual((cm.exception.code, cm.exception.value), ("max_bytes", 8))
+
+        # Far over the limit, the reported size is still in bytes.
+        with mock.patch("django_json_widget.parsing.UTF8_CHUNK_SIZE", 3), self.assertRaises(LimitExceeded) as cm:
+            check_limits('"éééé"', max_bytes=4)
+        self.assertEqual(cm.exception.value, 10)
+
+    def test_max_depth(self):
+        with self.assertRaises(LimitExceeded) as cm:
+            check_limits('[[[["deep"]]]]', max_depth=3)
+        self.assertEqual(cm.exception.code, "max_depth")
+
+    def test_max_nodes_ignores_keys(self):
+        # Two objects and three values, the keys are not counted.
+        check_limits('{"a": 1, "b": {"c": null}}', max_nodes=4)
+        with self.assertRaises(LimitExceeded) as cm:
+            check_limits('{"a": 1, "b": {"c": null}}', max_nodes=3)
+        self.assertEqual(cm.exception.code, "max_nodes")
+
+    def test_brackets_inside_strings_are_ignored(self):
+        check_limits('["[[[[", "\\"{{{{"]', max_depth=1, max_nodes=3)
+
+    def test_unterminated_string_scans_in_linear_time(self):
+        # Retrying the string from every later quote took minutes on this.
+        started = time.monotonic()
+        check_limits('"' + '\\"' * 500000, max_depth=32, max_nodes=1000)
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class DocumentForm(Form):
+    document = JSONEditorField(max_bytes=1024 * 1024, max_depth=32, max_nodes=1000)
+
+
+class FieldLimitTests(TestCase):
+    """Test limits surface as form errors"""
+
+    def test_valid_document(self):
+        form = DocumentForm({"document": '{"a": [1, 2, 3]}'})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["document"], {"a": [1, 2, 3]})
+
+    def test_errors(self):
+        cases = {
+            "max_bytes": "[" + "1," * (600 * 1024) + "1]",
+            "max_depth": "[" * 100000 + "]" * 100000,
+            "max_nodes": "[" + "1," * 5000 + "1]",
+        }
+        for code, payload in cases.items():
+            with self.subTest(code=code):
+                form = DocumentForm({"document": payload})
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.errors.as_data()["document"][0].code, code)
+
+    def test_peak_memory_is_bounded(self):
+        """Rejecting an oversized document allocates a fraction of its size"""
+        field = JSONEditorField(max_nodes=1000)
+        payloads = [
+            "[" + "1," * (2 * 1024 * 1024) + "1]",
+            "[" * (4 * 1024 * 1024) + "]" * (4 * 1024 * 1024),
+            '{"a": "' + "x" * (8 * 1024 * 1024) + '", ' + '"b": 1, ' * 2000 + '"c": 1}',
+        ]
+        for payload in payloads:
+            tracemalloc.start()
+            try:
+                with self.assertRaises(ValidationError):
+                    field.clean(payload)
+                _current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            self.assertLess(peak, 256 * 1024)
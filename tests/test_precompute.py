@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+"""
+test_precompute
+---------------
+
+Tests for precomputed document artefacts and the precompute_json command.
+"""
+from io import StringIO
+from unittest import mock
+
+from django import forms
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_json_widget.actions import bulk_patch
+from django_json_widget.admin import json_preview
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.models import PrecomputedJSON
+from django_json_widget.precompute import compute_artefacts, get_precomputed, precompute
+
+from .models import Document
+
+
+class ComputeArtefactsTests(TestCase):
+    """Test the artefacts of one document"""
+
+    def test_artefacts(self):
+        artefacts = compute_artefacts({"name": "é", "stats": {"hp": [1, 2]}})
+        self.assertEqual(artefacts["size"], len('{"name": "é", "stats": {"hp": [1, 2]}}'.encode()))
+        self.assertEqual(artefacts["nodes"], 6)
+        self.assertEqual(artefacts["depth"], 3)
+        self.assertEqual(artefacts["keys"], ["name", "stats"])
+        self.assertEqual(artefacts["preview"], '{"name": "é", "stats": {"hp": [1, 2]}}')
+        self.assertEqual(len(artefacts["digest"]), 64)
+
+    def test_scalar_and_long_documents(self):
+        self.assertEqual(compute_artefacts(3)["keys"], None)
+        self.assertEqual(compute_artefacts(3)["depth"], 0)
+        self.assertEqual(len(compute_artefacts(["x" * 500])["preview"]), 201)
+
+
+@override_settings(JSON_EDITOR_PRECOMPUTE_STORE="cache")
+class PrecomputeTests(TestCase):
+    """Test computing, skipping and invalidating stored artefacts"""
+
+    def setUp(self):
+        cache.clear()
+        self.docs = [Document.objects.create(name=str(i), data={"i": i}) for i in range(5)]
+        self.pks = [doc.pk for doc in self.docs]
+
+    def test_compute_then_skip_unchanged(self):
+        result = precompute(Document.objects.all(), ["data"], chunk_size=2, workers=0)
+        self.assertEqual(result, (5, 5, 0))
+        self.assertEqual(get_precomputed(Document, "data", self.pks)[self.pks[0]]["keys"], ["i"])
+
+        Document.objects.filter(pk=self.pks[1]).update(data={"i": "changed"})
+        result = precompute(Document.objects.all(), ["data"], chunk_size=2, workers=0)
+        self.assertEqual(result, (5, 1, 4))
+        self.assertEqual(get_precomputed(Document, "data", [self.pks[1]])[self.pks[1]]["preview"], '{"i": "changed"}')
+
+    def test_resume_skips_rows_with_entries(self):
+        precompute(Document.objects.filter(pk__in=self.pks[:3]), ["data"], workers=0)
+        with self.assertNumQueries(1):
+            result = precompute(Document.objects.all(), ["data", "other_data"], chunk_size=2, workers=0, resume=True)
+        self.assertEqual(result, (5, 7, 3))
+
+    def test_worker_processes(self):
+        progress = []
+        result = precompute(Document.objects.all(), ["data"], chunk_size=2, workers=2, progress=progress.append)
+        self.assertEqual(result, (5, 5, 0))
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(len(get_precomputed(Document, "data", self.pks)), 5)
+
+    def test_save_delete_and_bulk_updates_invalidate(self):
+        precompute(Document.objects.all(), ["data"], workers=0)
+        self.docs[0].save()
+        self.docs[1].delete()
+        bulk_patch(Document.objects.filter(pk=self.pks[2]), "data", {"j": 1}, "merge_patch")
+        self.assertEqual(sorted(get_precomputed(Document, "data", self.pks)), self.pks[3:])
+
+    @override_settings(
+        JSON_EDITOR_PRECOMPUTE_STORE="table", JSON_EDITOR_PRECOMPUTE_MODELS=["tests.CompressedDocument"],
+    )
+    def test_saves_of_other_models_skip_the_store(self):
+        with self.assertNumQueries(1):
+            self.docs[0].save()
+        self.assertEqual(get_precomputed(Document, "data", self.pks), {})
+        with self.assertRaises(ValueError):
+            precompute(Document.objects.all(), ["data"], workers=0)
+        with self.assertRaises(CommandError):
+            call_command("precompute_json", "tests.Document", "--workers", "0")
+
+    @override_settings(JSON_EDITOR_PRECOMPUTE_STORE="table")
+    def test_table_store(self):
+        precompute(Document.objects.all(), ["data"], workers=0)
+        self.assertEqual(PrecomputedJSON.objects.count(), 5)
+        self.assertEqual(get_precomputed(Document, "data", self.pks[:2])[self.pks[0]]["preview"], '{"i": 0}')
+
+        Document.objects.filter(pk=self.pks[0]).update(data={"i": -1})
+        self.assertEqual(precompute(Document.objects.all(), ["data"], workers=0), (5, 1, 4))
+        self.assertEqual(PrecomputedJSON.objects.count(), 5)
+        self.docs[0].delete()
+        self.assertEqual(PrecomputedJSON.objects.count(), 4)
+
+    def test_command(self):
+        out, err = StringIO(), StringIO()
+        call_command("precompute_json", "tests.Document", "--field", "data", "--workers", "0", stdout=out, stderr=err)
+        self.assertIn("Processed 5 rows: 5 artefacts computed, 0 skipped.", out.getvalue())
+        self.assertIn("per process", err.getvalue())
+        err = StringIO()
+        with self.settings(JSON_EDITOR_PRECOMPUTE_STORE="table"):
+            call_command("precompute_json", "tests.Document", "--workers", "0", stdout=out, stderr=err)
+        self.assertEqual(err.getvalue(), "")
+        with self.assertRaises(CommandError):
+            call_command("precompute_json", "tests.Document", "--field", "name")
+        with self.settings(JSON_EDITOR_PRECOMPUTE_STORE=None), self.assertRaises(CommandError):
+            call_command("precompute_json", "tests.Document")
+
+
+class DocumentForm(forms.ModelForm):
+    data = JSONEditorField()
+
+    class Meta:
+        model = Document
+        fields = ("data",)
+
+
+@override_settings(JSON_EDITOR_PRECOMPUTE_STORE="cache")
+class PrecomputedReadersTests(TestCase):
+    """Test the widget and changelist reading stored artefacts"""
+
+    def setUp(self):
+        cache.clear()
+        self.doc = Document.objects.create(name="doc", data={"name": "x" * 100})
+        precompute(Document.objects.all(), ["data"], workers=0)
+
+    def test_widget_summary(self):
+        self.assertIn("112\xa0bytes, 2 values, depth 1", str(DocumentForm(instance=self.doc)["data"]))
+        self.assertNotIn("values, depth", str(DocumentForm({"data": "{}"}, instance=self.doc)["data"]))
+        with self.settings(JSON_EDITOR_PRECOMPUTE_STORE=None):
+            self.assertNotIn("values, depth", str(DocumentForm(instance=self.doc)["data"]))
+
+    def test_column(self):
+        column = json_preview("data", length=20, link=False, precomputed=True)
+        self.assertFalse(hasattr(column, "admin_order_field"))
+        self.assertEqual(column(self.doc), '{"name": "xxxxxxxxx…')
+        with self.assertRaises(ValueError):
+            json_preview("data", "name", precomputed=True)
+
+    def test_changelist(self):
+        from .admin import DocumentAdmin
+
+        Document.objects.create(name="missing", data={"not": "precomputed"})
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "x"))
+        column = json_preview("data", length=20, link=False, precomputed=True)
+        with mock.patch.object(DocumentAdmin, "list_display", ["name", column]), self.assertNumQueries(6):
+            response = self.client.get(reverse("admin:tests_document_changelist"))
+        self.assertContains(response, '{&quot;name&quot;: &quot;xxxxxxxxx…')
+        self.assertContains(response, '{&quot;not&quot;: &quot;precompute…')
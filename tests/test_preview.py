@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""
+test_preview
+------------
+
+Tests for changelist JSON previews extracted in the database.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_json_widget.admin import json_preview
+
+from .models import Document
+
+
+class JSONPreviewColumnTests(TestCase):
+    """Test the column outside of a changelist"""
+
+    def setUp(self):
+        self.doc = Document.objects.create(name="doc", data={"stats": {"hp": 10}, "tags": ["a", "b"]})
+
+    def test_key_path(self):
+        column = json_preview("data", "stats__hp", link=False)
+        self.assertEqual(column(self.doc), "10")
+        self.assertEqual(column.short_description, "stats__hp")
+        self.assertEqual(column.admin_order_field, "data_stats_hp_preview")
+
+    def test_list_index_and_missing_keys(self):
+        self.assertEqual(json_preview("data", "tags__1", link=False)(self.doc), '"b"')
+        self.assertIsNone(json_preview("data", "missing__key", link=False)(self.doc))
+
+    def test_document_truncated(self):
+        self.assertEqual(json_preview("data", length=12, link=False)(self.doc), '{"stats": {…')
+
+    def test_link_to_change_form(self):
+        html = json_preview("data", "stats__hp")(self.doc)
+        url = reverse("admin:tests_document_change", args=[self.doc.pk])
+        self.assertEqual(html, f'<a href="{url}">10</a>')
+
+
+class JSONPreviewChangeListTests(TestCase):
+    """Test the changelist defers the previewed documents"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        Document.objects.create(name="weak", data={"stats": {"hp": 5}, "blob": "x" * 1000})
+        Document.objects.create(name="strong", data={"stats": {"hp": 50}, "blob": "x" * 1000})
+
+    def test_changelist_does_not_load_documents(self):
+        url = reverse("admin:tests_document_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, ">50</a>")
+        self.assertContains(response, '&quot;hp&quot;: 50…</a>')
+        self.assertNotContains(response, "x" * 100)
+
+        select = [q["sql"] for q in queries.captured_queries if '"tests_document"."name"' in q["sql"]][-1]
+        self.assertIn('AS "data_stats_hp_preview"', select)
+        # The document only appears inside the extracting expressions.
+        self.assertNotRegex(select, r'(SELECT|,) "tests_document"\."data"(,| FROM)')
+
+    def test_order_by_extracted_value(self):
+        url = reverse("admin:tests_document_changelist")
+        response = self.client.get(url, {"o": "-2"})
+        content = response.content.decode()
+        self.assertLess(content.index(">50</a>"), content.index(">5</a>"))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+
+"""
+test_schema
+-----------
+
+Tests for JSON Schema inference from stored documents.
+"""
+import json
+from io import StringIO
+from unittest import mock
+
+from django import forms
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from django_json_widget import schema
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.widgets import JSONEditorWidget
+
+from .models import Document
+
+
+def infer(*documents):
+    summary = schema.summarize(documents[0])
+    for document in documents[1:]:
+        summary = schema.merge(summary, schema.summarize(document))
+    return schema.to_json_schema(summary)
+
+
+class InferenceTests(TestCase):
+    """Test merging type summaries"""
+
+    def test_objects(self):
+        self.assertEqual(infer({"name": "a", "hp": 1}, {"name": "b", "tags": []}), {
+            "$schema": schema.SCHEMA_DRAFT,
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "hp": {"type": "integer"},
+                "tags": {"type": "array"},
+            },
+            "required": ["name"],
+        })
+
+    def test_mixed_types_and_arrays(self):
+        inferred = infer({"v": [1, 2.5, None]}, {"v": "x"})
+        self.assertEqual(inferred["properties"]["v"], {
+            "type": ["array", "string"],
+            "items": {"type": ["null", "number"]},
+        })
+        self.assertEqual(infer([{"a": True}, {"a": False, "b": 1}])["items"]["required"], ["a"])
+
+    def test_bounded(self):
+        with mock.patch.object(schema, "MAX_PROPERTIES", 2):
+            summary = schema.merge(schema.summarize({"a": 1, "b": 1}), schema.summarize({"c": 1}))
+        self.assertEqual(list(summary["properties"]), ["a", "b"])
+        self.assertTrue(summary["truncated"])
+        with mock.patch.object(schema, "MAX_DEPTH", 1):
+            self.assertEqual(infer({"a": {"b": 1}})["properties"]["a"], {"type": "object"})
+
+
+class InferSchemaTests(TestCase):
+    """Test scanning rows and registering the schema"""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            Document.objects.create(name=str(i), data={"i": i, "name": "doc"})
+
+    def test_infer_schema(self):
+        inferred, report = schema.infer_schema(Document.objects.all(), "data", chunk_size=2)
+        self.assertEqual(inferred["required"], ["i", "name"])
+        self.assertEqual(report.rows, 5)
+        self.assertEqual(report.characters, sum(len(f'{{"i": {i}, "name": "doc"}}') for i in range(5)))
+
+        _inferred, report = schema.infer_schema(Document.objects.all(), "data", sample=3)
+        self.assertEqual(report.rows, 3)
+
+    def test_command_registers_schema(self):
+        out = StringIO()
+        call_command("infer_json_schema", "tests.Document", "data", "--print", stdout=out)
+        self.assertIn("Scanned 5 rows", out.getvalue())
+        registered = schema.get_schema(Document, "data")
+        self.assertEqual(registered["properties"]["i"], {"type": "integer"})
+        self.assertIn(json.dumps(registered, indent=2), out.getvalue())
+        self.assertEqual(schema.get_report(Document, "data").rows, 5)
+
+        call_command("infer_json_schema", "tests.Document", "other_data", "--dry-run", stdout=out)
+        self.assertIsNone(schema.get_schema(Document, "other_data"))
+        with self.assertRaises(CommandError):
+            call_command("infer_json_schema", "tests.Document", "name")
+
+
+class DocumentForm(forms.ModelForm):
+    data = JSONEditorField()
+
+    class Meta:
+        model = Document
+        fields = ("data",)
+
+
+class WidgetSchemaTests(TestCase):
+    """Test handing registered schemas to the editor"""
+
+    def setUp(self):
+        cache.clear()
+        self.schema = {"type": "object", "required": ["i"]}
+
+    def test_explicit_schema(self):
+        html = JSONEditorWidget(schema=self.schema).render("data", {})
+        self.assertIn('"schema": {"type": "object", "required": ["i"]}', html)
+        self.assertNotIn('"schema"', JSONEditorWidget().render("data", {}))
+
+    def test_registered_schema_by_label(self):
+        widget = JSONEditorWidget(schema="tests.document.data")
+        self.assertNotIn('"schema"', widget.render("data", {}))
+        schema.register_schema(Document, "data", self.schema)
+        self.assertIn('"schema": {"type": "object"', widget.render("data", {}))
+
+    def test_model_form_uses_registered_schema(self):
+        self.assertNotIn('"schema"', str(DocumentForm()["data"]))
+        schema.register_schema(Document, "data", self.schema)
+        self.assertIn('"schema": {"type": "object"', str(DocumentForm()["data"]))
+        self.assertIsNone(DocumentForm.base_fields["data"].widget.schema)
+        schema.unregister_schema(Document, "data")
+        self.assertNotIn('"schema"', str(DocumentForm()["data"]))
+
+    def test_registration_outlives_cache(self):
+        schema.register_schema(Document, "data", self.schema, schema.InferenceReport(5, 100, 0.5))
+        cache.clear()
+        self.assertEqual(schema.get_schema(Document, "data"), self.schema)
+        with self.assertNumQueries(0):
+            self.assertEqual(schema.get_report(Document, "data"), (5, 100, 0.5))
+            self.assertEqual(schema.get_schema(Document, "data"), self.schema)
+        self.assertIsNone(schema.get_schema(Document, "other_data"))
+        with self.assertNumQueries(0):
+            self.assertIsNone(schema.get_schema(Document, "other_data"))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+
+"""
+test_shared_field
+-----------------
+
+Tests for `SharedJSONField`.
+"""
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django import forms
+from django.core import serializers
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.models import (
+    SharedJSON,
+    SharedJSONField,
+    SharedJSONRef,
+    canonical_json,
+    collect_shared_json,
+    shared_documents,
+)
+from django_json_widget.widgets import JSONEditorWidget
+
+from .models import SharedDocument
+
+CONFIG = {"theme": "dark", "limits": {"rows": 100, "cols": 10}}
+
+
+class SharedJSONFieldTests(TestCase):
+
+    def setUp(self):
+        shared_documents.clear()
+
+    def test_identical_documents_stored_once(self):
+        for i in range(3):
+            SharedDocument.objects.create(name=str(i), config={"limits": {"cols": 10, "rows": 100}, "theme": "dark"})
+        SharedDocument.objects.bulk_create([SharedDocument(config=CONFIG), SharedDocument(config={"other": 1})])
+        self.assertEqual(SharedJSON.objects.count(), 2)
+        self.assertEqual(
+            SharedJSON.objects.get(content__contains="theme").content,
+            '{"limits":{"cols":10,"rows":100},"theme":"dark"}',
+        )
+        self.assertEqual(SharedDocument.objects.filter(config=CONFIG).count(), 4)
+
+    def test_loaded_on_first_access_through_cache(self):
+        SharedDocument.objects.create(config=CONFIG)
+        shared_documents.clear()
+        doc = SharedDocument.objects.get()
+        self.assertIsInstance(doc.__dict__["config"], SharedJSONRef)
+        with self.assertNumQueries(1):
+            self.assertEqual(doc.config, CONFIG)
+        other = SharedDocument.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(other.config, CONFIG)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(shared_documents, "size", 2):
+            for i in range(3):
+                SharedDocument.objects.create(config={"i": i})
+        self.assertEqual(len(shared_documents.entries), 2)
+
+    def test_copy_on_write(self):
+        first = SharedDocument.objects.create(config=CONFIG)
+        second = SharedDocument.objects.create(config=CONFIG)
+        second = SharedDocument.objects.get(pk=second.pk)
+        second.config["theme"] = "light"
+        second.save()
+        self.assertEqual(SharedDocument.objects.get(pk=first.pk).config, CONFIG)
+        self.assertEqual(SharedDocument.objects.get(pk=second.pk).config["theme"], "light")
+        self.assertEqual(SharedJSON.objects.count(), 2)
+
+    def test_untouched_value_saved_without_encoding(self):
+        SharedDocument.objects.create(config=CONFIG)
+        doc = SharedDocument.objects.get()
+        with self.assertNumQueries(1):
+            doc.save()
+        self.assertIsInstance(doc.__dict__["config"], SharedJSONRef)
+
+    def test_large_and_scalar_documents_validate(self):
+        for value in ({f"k{i}": i for i in range(100)}, list(range(100)), "x" * 100, 7, 2.5, True):
+            doc = SharedDocument(config=value)
+            doc.full_clean()
+            doc.save()
+            shared_documents.clear()
+            self.assertEqual(SharedDocument.objects.get(pk=doc.pk).config, value)
+
+        class SharedDocumentForm(forms.ModelForm):
+            class Meta:
+                model = SharedDocument
+                fields = ("config",)
+
+        form = SharedDocumentForm({"config": json.dumps({f"k{i}": i for i in range(100)})})
+        self.assertTrue(form.is_valid(), form.errors)
+        form = SharedDocumentForm({"config": "42"})
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(SharedDocument.objects.get(pk=form.save().pk).config, 42)
+
+    def test_reads_without_cache(self):
+        SharedDocument.objects.create(config=CONFIG)
+        with mock.patch.object(shared_documents, "size", 0):
+            shared_documents.clear()
+            self.assertEqual(SharedDocument.objects.get().config, CONFIG)
+        self.assertEqual(shared_documents.entries, {})
+
+    def test_values_and_null(self):
+        SharedDocument.objects.create(config=CONFIG)
+        ref, extra = SharedDocument.objects.values_list("config", "extra").get()
+        self.assertEqual(ref.load(), CONFIG)
+        self.assertIsNone(extra)
+
+    def test_formfield(self):
+        class SharedDocumentForm(forms.ModelForm):
+            class Meta:
+                model = SharedDocument
+                fields = ("config",)
+
+        form_field = SharedDocumentForm.base_fields["config"]
+        self.assertIsInstance(form_field, JSONEditorField)
+        self.assertIsInstance(form_field.widget, JSONEditorWidget)
+
+        doc = SharedDocument.objects.create(config=CONFIG)
+        form = SharedDocumentForm({"config": '{"theme": "light"}'}, instance=SharedDocument.objects.get())
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertEqual(SharedDocument.objects.get(pk=doc.pk).config, {"theme": "light"})
+
+    def test_serialization(self):
+        SharedDocument.objects.create(config=CONFIG)
+        data = serializers.serialize("json", SharedDocument.objects.all())
+        self.assertIn('"config": {"limits"', data)
+        SharedDocument.objects.all().delete()
+        for obj in serializers.deserialize("json", data):
+            obj.save()
+        self.assertEqual(SharedDocument.objects.get().config, CONFIG)
+
+    def test_deconstruct(self):
+        self.assertEqual(SharedJSONField().deconstruct()[3], {})
+        self.assertEqual(SharedJSONField(db_index=False).deconstruct()[3], {"db_index": False})
+
+    def test_canonical_json(self):
+        self.assertEqual(canonical_json({"b": [1, "é"], "a": None}), '{"a":null,"b":[1,"é"]}')
+
+
+class CollectSharedJSONTests(TestCase):
+    """Test garbage collection of unreferenced documents"""
+
+    def test_collect(self):
+        kept = SharedDocument.objects.create(config=CONFIG, extra={"extra": 1})
+        dropped = SharedDocument.objects.create(config={"old": 1})
+        dropped.config = {"new": 1}
+        dropped.save()
+        SharedDocument.objects.create(config={"deleted": 1}).delete()
+        self.assertEqual(SharedJSON.objects.count(), 5)
+
+        # Recently stored documents are kept.
+        self.assertEqual(collect_shared_json(), 0)
+        SharedJSON.objects.update(touched=timezone.now() - timedelta(hours=2))
+        out = StringIO()
+        call_command("collect_shared_json", stdout=out)
+        self.assertIn("Deleted 2 unused shared JSON documents.", out.getvalue())
+        self.assertEqual(SharedJSON.objects.count(), 3)
+        shared_documents.clear()
+        kept = SharedDocument.objects.get(pk=kept.pk)
+        self.assertEqual((kept.config, kept.extra), (CONFIG, {"extra": 1}))
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+"""
+test_telemetry
+--------------
+
+Tests for the client-side performance marks and the telemetry beacon.
+"""
+
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from django_json_widget import telemetry
+from django_json_widget.widgets import JSONEditorWidget
+
+
+class TelemetryAggregationTests(TestCase):
+    """Test folding of samples into the cached aggregate"""
+
+    def setUp(self):
+        telemetry.reset()
+
+    def test_clean_samples_drops_malformed_entries(self):
+        samples = [
+            {"phase": "parse", "duration": 3.5, "size": 100},
+            {"phase": "unknown", "duration": 1, "size": 1},
+            {"phase": "set", "duration": "1", "size": 1},
+            {"phase": "set", "duration": True, "size": 1},
+            {"phase": "set", "duration": -1, "size": 1},
+            {"phase": "set", "duration": 10 ** 9, "size": 1},
+            "garbage",
+        ]
+        self.assertEqual(telemetry.clean_samples(samples), [("parse", 3.5, 100)])
+        self.assertEqual(telemetry.clean_samples({"phase": "parse"}), [])
+
+    def test_record_aggregates_per_phase_and_size(self):
+        telemetry.record([("parse", 1.0, 10), ("parse", 40.0, 2 * 1024 * 1024), ("set", 150.0, 10)])
+
+        report = telemetry.report()
+        phases = {row["phase"]: row for row in report["phases"]}
+        self.assertEqual(phases["parse"]["count"], 2)
+        self.assertEqual(phases["parse"]["p50"], 1)
+        self.assertEqual(phases["parse"]["p95"], 50)
+        self.assertEqual(phases["set"]["p50"], 200)
+
+        sizes = {(row["size"], row["phase"]): row["count"] for row in report["sizes"]}
+        self.assertEqual(sizes, {("<10KB", "parse"): 1, ("<10KB", "set"): 1, ("<10MB", "parse"): 1})
+
+    def test_slowest_bucket_has_no_upper_bound(self):
+        telemetry.record([("construct", 20000.0, 1)])
+        self.assertIsNone(telemetry.report()["phases"][0]["p50"])
+
+
+class TelemetryViewTests(TestCase):
+    """Test the beacon endpoint and the admin report"""
+
+    def setUp(self):
+        telemetry.reset()
+
+    def test_beacon_records_samples(self):
+        url = reverse("django_json_widget:telemetry")
+        payload = json.dumps({"samples": [{"phase": "parse", "duration": 2, "size": 5}]})
+        response = self.client.post(url, payload, content_type="text/plain")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(telemetry.get_aggregates()["phases"], {})
+
+        self.client.force_login(User.objects.create_user("editor", password="pw"))
+        response = self.client.post(url, payload, content_type="text/plain")
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(telemetry.get_aggregates()["phases"]["parse"]["count"], 1)
+
+    def test_beacon_rejects_invalid_payloads(self):
+        url = reverse("django_json_widget:telemetry")
+        self.client.force_login(User.objects.create_user("editor", password="pw"))
+        self.assertEqual(self.client.post(url, "not json", content_type="text/plain").status_code, 400)
+        self.assertEqual(self.client.post(url, "[]", content_type="text/plain").status_code, 400)
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+    def test_report_requires_staff(self):
+        url = reverse("django_json_widget:telemetry_report")
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        user = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.client.force_login(user)
+        telemetry.record([("set", 12.0, 100)])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<td>set</td>", html=False)
+
+
+class TelemetryTemplateTests(TestCase):
+    """Test the performance marks emitted by the widget script"""
+
+    def test_performance_marks_rendered(self):
+        html = JSONEditorWidget().render("test_field", "{}", {"id": "id_test_field"})
+
+        self.assertIn('"django_json_widget:id_test_field:"', html)
+        self.assertIn('measure("parse", "start", "parsed"', html)
+        self.assertRegex(html, r'mark\("start"\);\s*var data = JSON\.parse\(content\);')
+        self.assertNotIn("sendBeacon", html)
+
+    @override_settings(JSON_EDITOR_TELEMETRY=True)
+    def test_beacon_rendered_when_enabled(self):
+        widget = JSONEditorWidget()
+        context = widget.get_context("test_field", "{}", {"id": "id_test_field"})
+        self.assertEqual(context["widget"]["telemetry_url"], reverse("django_json_widget:telemetry"))
+
+        html = widget.render("test_field", "{}", {"id": "id_test_field"})
+        self.assertIn("navigator.sendBeacon", html)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""
+test_unchanged
+--------------
+
+Tests for skipping untouched documents via the signed "unchanged" marker.
+"""
+
+from unittest import mock, skipUnless
+
+import django
+from django.forms import Form, ModelForm
+from django.test import TestCase
+
+from django_json_widget import widgets
+from django_json_widget.forms import JSONEditorField
+from django_json_widget.widgets import JSONEditorWidget, UnchangedValue
+
+from .models import Document
+
+INITIAL = {"name": "test", "items": list(range(10))}
+
+
+class DocumentForm(Form):
+    document = JSONEditorField(required=False)
+
+
+class DocumentModelForm(ModelForm):
+    class Meta:
+        model = Document
+        fields = ("data",)
+        field_classes = {"data": JSONEditorField}  # noqa: RUF012
+
+
+def rendered_token(form, name="document"):
+    context = form[name].field.widget.get_context(name, form[name].value(), {"id": "id_" + name})
+    return context["widget"]["unchanged_token"]
+
+
+@skipUnless(django.VERSION >= (4, 0), "the marker is only enabled on Django 4.0+")
+class UnchangedMarkerTests(TestCase):
+    """Test resolution of the marker back to the stored value"""
+
+    def test_marker_rendered_for_editor_field_only(self):
+        form = DocumentForm(initial={"document": INITIAL})
+        html = str(form["document"])
+        self.assertIn('name="document__unchanged"', html)
+        self.assertIn("textarea.disabled = true", html)
+
+        html = JSONEditorWidget().render("document", "{}", {"id": "id_document"})
+        self.assertNotIn("__unchanged", html)
+
+    def test_unchanged_marker_uses_initial_without_parsing(self):
+        token = rendered_token(DocumentForm(initial={"document": INITIAL}))
+        form = DocumentForm({"document__unchanged": token}, initial={"document": INITIAL})
+
+        with mock.patch("django.forms.fields.json.loads") as loads:
+            self.assertTrue(form.is_valid())
+            self.assertEqual(form.changed_data, [])
+        loads.assert_not_called()
+        self.assertIs(form.cleaned_data["document"], INITIAL)
+
+    def test_marker_checked_once(self):
+        token = rendered_token(DocumentForm(initial={"document": INITIAL}))
+        form = DocumentForm({"document__unchanged": token}, initial={"document": INITIAL})
+        with mock.patch.object(widgets, "value_digest", wraps=widgets.value_digest) as digest:
+            self.assertTrue(form.is_valid())
+            self.assertEqual(form.changed_data, [])
+        self.assertEqual(digest.call_count, 1)
+
+    def test_callable_default_posts_no_hidden_initial(self):
+        document = Document.objects.create(name="doc", data=INITIAL)
+        form = DocumentModelForm(instance=document)
+        self.assertTrue(form.fields["data"].widget.unchanged_marker)
+        self.assertNotIn("initial-data", str(form))
+
+        token = rendered_token(form, "data")
+        form = DocumentModelForm({"data__unchanged": token}, instance=document)
+        with mock.patch("django.forms.fields.json.loads") as loads:
+            self.assertTrue(form.is_valid())
+            self.assertEqual(form.changed_data, [])
+        loads.assert_not_called()
+
+    def test_edited_value_takes_precedence(self):
+        token = rendered_token(DocumentForm(initial={"document": INITIAL}))
+        form = DocumentForm(
+            {"document": '{"name": "edited"}', "document__unchanged": token}, initial={"document": INITIAL}
+        )
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["document"], {"name": "edited"})
+        self.assertEqual(form.changed_data, ["document"])
+
+    def test_forged_marker_never_overwrites(self):
+        form = DocumentForm({"document__unchanged": "forged:token"}, initial={"document": INITIAL})
+        self.assertFalse(form.is_valid())
+        self.assertIn("document", form.errors)
+
+    def test_stale_marker_rejected(self):
+        token = rendered_token(DocumentForm(initial={"document": {"old": True}}))
+        form = DocumentForm({"document__unchanged": token}, initial={"document": INITIAL})
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["document"][0][:16], "The stored value")
+
+    def test_string_initial(self):
+        token = rendered_token(DocumentForm(initial={"document": "plain"}))
+        form = DocumentForm({"document__unchanged": token}, initial={"document": "plain"})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["document"], "plain")
+        self.assertEqual(form.changed_data, [])
+
+    def test_rerender_after_error_keeps_initial(self):
+        token = rendered_token(DocumentForm(initial={"document": INITIAL}))
+        form = DocumentForm({"document__unchanged": token}, initial={"document": INITIAL})
+        self.assertEqual(form["document"].value(), form.fields["document"].prepare_value(INITIAL))
+
+    def test_widget_returns_marker_object(self):
+        widget = JSONEditorWidget()
+        widget.unchanged_marker = True
+        value = widget.value_from_datadict({"doc__unchanged": "x"}, {}, "doc")
+        self.assertIsInstance(value, UnchangedValue)
+        self.assertFalse(widget.value_omitted_from_data({"doc__unchanged": "x"}, {}, "doc"))
+
+    def test_marker_ignored_when_disabled(self):
+        widget = JSONEditorWidget()
+        self.assertIsNone(widget.value_from_datadict({"doc__unchanged": "x"}, {}, "doc"))
+        self.assertTrue(widget.value_omitted_from_data({"doc__unchanged": "x"}, {}, "doc"))